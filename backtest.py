@@ -0,0 +1,184 @@
+# backtest.py — Vectorized replay of ladder entries, SL and TP over OHLCV history
+#
+# Each signal places the ladder at the signal bar's close: the level at market fills
+# immediately, the others are resting limits, and SL/TP are watched from the next bar.
+# A bar that touches both SL and TP is counted as a stop (conservative).
+
+import numpy as np
+import pandas as pd
+
+from indicators import indicator_frame
+from ladder_batch import batch_ladders
+from ladder_core import DEFAULT_PARAMS, LadderParams
+from sim_kernel import simulate_loop
+
+HORIZON = 120  # bars a ladder stays live before it is closed at market
+
+# ---------- Simulation Kernel ----------
+def simulate(high, low, close, sig_pos, is_long, levels, sl, tp, horizon: int = HORIZON):
+    # high/low/close: (n,) bars; sig_pos: (S,) bar index of each signal; levels: (S, 3), NaN = unused.
+    # Returns fill_bar (S, 3; -1 = unfilled), exit_bar (S,), exit_price (S,), exit_reason (S,) codes.
+    n, S = len(close), len(sig_pos)
+    offs = np.arange(horizon + 1)
+    win = sig_pos[:, None] + offs[None, :]
+    in_range = win < n
+    win = np.minimum(win, n - 1)
+    hi, lo = high[win], low[win]
+    hi[~in_range], lo[~in_range] = np.nan, np.nan
+    after = offs[None, :] >= 1
+    sign = np.where(is_long, 1.0, -1.0)[:, None]
+
+    # Exits are watched from the bar after the signal
+    sl_hit = after & np.where(is_long[:, None], lo <= sl[:, None], hi >= sl[:, None])
+    tp_hit = after & np.where(is_long[:, None], hi >= tp[:, None], lo <= tp[:, None])
+    first_sl = np.where(sl_hit.any(1), sl_hit.argmax(1), horizon + 1)
+    first_tp = np.where(tp_hit.any(1), tp_hit.argmax(1), horizon + 1)
+    last_col = np.minimum(horizon, n - 1 - sig_pos)
+    exit_col = np.minimum(np.minimum(first_sl, first_tp), last_col)
+    reason = np.where(first_sl <= np.minimum(first_tp, last_col), 1,
+                      np.where(first_tp <= last_col, 2, 3))  # 1 = SL, 2 = TP, 3 = timeout
+    exit_price = np.where(reason == 1, sl, np.where(reason == 2, tp, close[sig_pos + exit_col]))
+
+    # Levels: at or through market fill at the signal bar, the rest as limits
+    mkt = close[sig_pos][:, None]
+    immediate = (levels - mkt) * sign >= 0
+    touch = np.where(is_long[:, None, None], lo[:, None, :] <= levels[:, :, None], hi[:, None, :] >= levels[:, :, None])
+    touch &= after[:, None, :]
+    fill_col = np.where(immediate, 0, np.where(touch.any(2), touch.argmax(2), horizon + 1))
+    filled = ~np.isnan(levels) & (fill_col <= exit_col[:, None])
+    fill_bar = np.where(filled, sig_pos[:, None] + fill_col, -1)
+    return fill_bar, sig_pos + exit_col, exit_price, reason
+
+# ---------- Intrabar Resolution ----------
+def ambiguous_exits(high, low, sig_pos, is_long, fill_bar, exit_bar, reason, sl, tp):
+    # Exit bars whose order of events the bar alone can't tell: SL and TP both touched,
+    # or a resting level and the TP touched on the same bar.
+    sl_touch = np.where(is_long, low[exit_bar] <= sl, high[exit_bar] >= sl)
+    tp_touch = np.where(is_long, high[exit_bar] >= tp, low[exit_bar] <= tp)
+    same_bar_fill = (fill_bar == exit_bar[:, None]).any(1) & (exit_bar > sig_pos)
+    return (exit_bar > sig_pos) & ((sl_touch & tp_touch) | ((reason == 2) & same_bar_fill))
+
+def resolve_intrabar(bar_index, sig_pos, is_long, levels, sl, tp, fill_bar, exit_bar, exit_price, reason,
+                     high, low, lower_tf):
+    # Replays only the ambiguous exit bars on lower-timeframe data. lower_tf(start, end) returns
+    # the bars in [start, end) as anything with "high"/"low" columns (DataFrame, OHLCVStore.slice),
+    # so finer data is loaded just for those windows. Returns (ambiguous, resolved) masks.
+    fill_bar, exit_price, reason = fill_bar.copy(), exit_price.copy(), reason.copy()
+    ambiguous = ambiguous_exits(high, low, sig_pos, is_long, fill_bar, exit_bar, reason, sl, tp)
+    resolved = np.zeros_like(ambiguous)
+    bar_len = pd.Timedelta(np.median(np.diff(bar_index.asi8))) if len(bar_index) > 1 else pd.Timedelta("1h")
+    for i in np.flatnonzero(ambiguous):
+        eb, lg = exit_bar[i], is_long[i]
+        sub = lower_tf(bar_index[eb], bar_index[eb] + bar_len)
+        sub_hi, sub_lo = np.asarray(sub["high"], dtype=np.float64), np.asarray(sub["low"], dtype=np.float64)
+        if not len(sub_hi):
+            continue
+        pending = fill_bar[i] == eb
+        fills = np.zeros_like(pending)
+        outcome = 0
+        for h, l in zip(sub_hi, sub_lo):
+            fills |= pending & ((l <= levels[i]) if lg else (h >= levels[i]))
+            sl_hit, tp_hit = (l <= sl[i], h >= tp[i]) if lg else (h >= sl[i], l <= tp[i])
+            if sl_hit or tp_hit:
+                outcome = 1 if sl_hit else 2
+                break
+        if outcome == 0:
+            continue  # lower timeframe disagrees with the bar; keep the conservative result
+        fill_bar[i] = np.where(pending & ~fills, -1, fill_bar[i])
+        reason[i], exit_price[i] = outcome, sl[i] if outcome == 1 else tp[i]
+        resolved[i] = True
+    return fill_bar, exit_price, reason, ambiguous, resolved
+
+# ---------- Trade Report ----------
+EXIT_REASONS = np.array(["", "SL", "TP", "timeout"])
+
+def trade_pnl(side, levels, sl, fill_bar, exit_price):
+    # One unit per filled level; R is PnL over the summed level-to-SL risk of the fills
+    sign = np.where(np.asarray(side) == "Long", 1.0, -1.0)
+    filled = fill_bar >= 0
+    qty = filled.sum(1)
+    entry_sum = np.where(filled, levels, 0.0).sum(1)
+    pnl = sign * (exit_price * qty - entry_sum)
+    risk = np.where(filled, np.abs(levels - sl[:, None]), 0.0).sum(1)
+    r_multiple = np.where(risk > 0, pnl / np.where(risk > 0, risk, 1.0), np.nan)
+    return qty, entry_sum, pnl, r_multiple
+
+def trade_report(sig_index, sig_pos, side, levels, sl, tp, fill_bar, exit_bar, exit_price, reason, bar_index,
+                 ambiguous=None, resolved=None):
+    qty, entry_sum, pnl, r_multiple = trade_pnl(side, levels, sl, fill_bar, exit_price)
+    avg_entry = np.where(qty > 0, entry_sum / np.maximum(qty, 1), np.nan)
+    out = pd.DataFrame({
+        "signal_time": sig_index, "side": side,
+        "L0": levels[:, 0], "L1": levels[:, 1], "L2": levels[:, 2], "sl": sl, "tp": tp,
+        "fills": qty, "avg_entry": avg_entry,
+        "exit_time": bar_index[exit_bar], "exit_price": exit_price, "exit_reason": EXIT_REASONS[reason],
+        "bars_held": exit_bar - sig_pos,
+        "pnl": pnl, "r_multiple": r_multiple,
+    })
+    if ambiguous is not None:
+        out["ambiguous"], out["resolved"] = ambiguous, resolved
+    return out
+
+# ---------- Backtest ----------
+def prepare_signals(ohlcv: pd.DataFrame, signals: pd.DataFrame, indicators: pd.DataFrame | None = None) -> pd.DataFrame:
+    # signals: indexed by bar timestamp with side, zone_upper, zone_lower; atr/adx/macd/rsi_trigger columns
+    # override the values computed from ohlcv (1h bars) when present.
+    ind = indicators if indicators is not None else indicator_frame(ohlcv)
+    sig = signals.join(ind.drop(columns=[c for c in ind.columns if c in signals.columns]), how="left")
+    sig["pos"] = ohlcv.index.get_indexer(sig.index)
+    if (sig["pos"] < 0).any():
+        raise ValueError("Every signal timestamp must be a bar in the OHLCV index.")
+    sig["adx"], sig["macd"] = sig["adx"].fillna(0.0), sig["macd"].fillna("Neutral")
+    sig["rsi_trigger"] = sig["rsi_trigger"].fillna("None") if "rsi_trigger" in sig else "None"
+    return sig
+
+def gate_signals(signals: pd.DataFrame, indicators: pd.DataFrame, triggers=("Crossed 20↑", "Crossed 50↑")) -> pd.DataFrame:
+    # Keep only signals whose bar has one of the RSI-3 crossings (from indicator_frame's one pass)
+    trig = indicators["rsi_trigger"].reindex(signals.index)
+    return signals[trig.isin(triggers).to_numpy()]
+
+def backtest_arrays(high, low, close, sig_pos, side, zone_upper, zone_lower, atr, adx, macd,
+                    sl_buf: float = 1.0, params: LadderParams = DEFAULT_PARAMS, horizon: int = HORIZON,
+                    engine: str = "vector", rsi_trigger="None"):
+    # Pure-array core shared by run_backtest and the parameter sweep.
+    # engine="vector" uses the window-matrix kernel, "loop" the (JIT) bar-by-bar kernel.
+    res = batch_ladders(side, close[sig_pos], zone_upper, zone_lower, atr, adx, macd, sl_buf, params, rsi_trigger)
+    ok = res["valid"]
+    res, sig_pos, side = res[ok], sig_pos[ok], side[ok]
+    levels = np.stack([res["L0"], res["L1"], res["L2"]], axis=1)
+    # Contiguous copies keep the JIT kernel on the signature compiled by warm_up()
+    sl, tp = np.ascontiguousarray(res["sl"]), np.ascontiguousarray(res["tp"])
+    high, low, close = (np.ascontiguousarray(a, dtype=np.float64) for a in (high, low, close))
+    sim = simulate if engine == "vector" else simulate_loop
+    fill_bar, exit_bar, exit_price, reason = sim(high, low, close, sig_pos.astype(np.int64), side == "Long",
+                                                 levels, sl, tp, horizon)
+    return ok, sig_pos, side, levels, sl, tp, fill_bar, exit_bar, exit_price, reason
+
+def run_backtest(ohlcv: pd.DataFrame, signals: pd.DataFrame, sl_buf: float = 1.0, horizon: int = HORIZON,
+                 indicators: pd.DataFrame | None = None, params: LadderParams = DEFAULT_PARAMS,
+                 engine: str = "vector", lower_tf=None) -> pd.DataFrame:
+    # lower_tf: optional callable (start, end) -> finer bars, used only for ambiguous exit bars
+    sig = prepare_signals(ohlcv, signals, indicators)
+    high, low, close = (ohlcv[c].to_numpy(np.float64) for c in ("high", "low", "close"))
+    ok, sig_pos, side, levels, sl, tp, fill_bar, exit_bar, exit_price, reason = backtest_arrays(
+        high, low, close, sig["pos"].to_numpy(), sig["side"].to_numpy(dtype=str),
+        sig["zone_upper"].to_numpy(np.float64), sig["zone_lower"].to_numpy(np.float64),
+        sig["atr"].to_numpy(np.float64), sig["adx"].to_numpy(np.float64), sig["macd"].to_numpy(dtype=str),
+        sl_buf, params, horizon, engine, sig["rsi_trigger"].to_numpy(dtype=str))
+    ambiguous = resolved = None
+    if lower_tf is not None:
+        fill_bar, exit_price, reason, ambiguous, resolved = resolve_intrabar(
+            ohlcv.index, sig_pos, side == "Long", levels, sl, tp, fill_bar, exit_bar, exit_price, reason,
+            high, low, lower_tf)
+    return trade_report(sig.index[ok], sig_pos, side, levels, sl, tp, fill_bar, exit_bar, exit_price, reason,
+                        ohlcv.index, ambiguous, resolved)
+
+def summarize(pnl, r_multiple, reason) -> dict:
+    r = r_multiple[~np.isnan(r_multiple)]
+    return {
+        "trades": int(len(pnl)), "total_pnl": float(np.sum(pnl)),
+        "win_rate": float(np.mean(pnl > 0)) if len(pnl) else np.nan,
+        "mean_r": float(r.mean()) if len(r) else np.nan,
+        "tp_rate": float(np.mean(reason == 2)) if len(reason) else np.nan,
+        "sl_rate": float(np.mean(reason == 1)) if len(reason) else np.nan,
+    }
@@ -0,0 +1,122 @@
+# bench_ladder.py — Latency, throughput and peak-memory benchmarks for the ladder compute path
+#
+#   python bench_ladder.py                    # 1e3 / 1e5 / 1e7 rows, appends to bench_results.jsonl
+#   python bench_ladder.py --sizes 1000 100000 --no-save
+
+import argparse
+import json
+import subprocess
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from ladder_batch import batch_ladders
+from ladder_core import compute_ladder
+
+RESULTS_FILE = "bench_results.jsonl"
+REGRESSION_TOL = 1.25       # vs the median of the last RECENT_RUNS runs
+SUB_MS_TOL = 1.5            # µs-scale timings jitter more run to run
+RECENT_RUNS = 5
+
+# ---------- Inputs ----------
+def make_inputs(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    zone_lower = rng.uniform(10, 1000, n)
+    zone_upper = zone_lower + rng.uniform(0.1, 50, n)
+    return dict(
+        side=rng.choice(np.array(["Long", "Short"]), n),
+        market=zone_lower + rng.uniform(-10, 60, n).clip(0.01),
+        zone_upper=zone_upper, zone_lower=zone_lower,
+        atr=rng.uniform(0.1, 20, n), adx=rng.uniform(0, 50, n),
+        macd=rng.choice(np.array(["Neutral", "Bullish", "Bearish"]), n),
+        sl_buf=rng.choice(np.array([1.0, 1.5]), n),
+        rsi_trigger=rng.choice(np.array(["None", "Crossed 20↑", "Crossed 50↑"]), n),
+    )
+
+# ---------- Benchmarks ----------
+def best_of(fn, repeat: int, number: int = 1) -> float:
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number
+
+def peak_mem(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_scalar():
+    args = ("Long", 100.0, 101.0, 95.0, 2.0, 20.0, "Bullish", 1.0, "Crossed 50↑")
+    return {"name": "scalar.compute_ladder", "rows": 1,
+            "seconds": best_of(lambda: compute_ladder(*args), repeat=5, number=10_000),
+            "peak_bytes": peak_mem(lambda: compute_ladder(*args))}
+
+def bench_scalar_loop(n: int):
+    cols = make_inputs(n)
+    rows = list(zip(*(cols[k].tolist() for k in ("side", "market", "zone_upper", "zone_lower", "atr", "adx", "macd", "sl_buf", "rsi_trigger"))))
+    def run():
+        for r in rows:
+            compute_ladder(*r)
+    secs = best_of(run, repeat=3)
+    return {"name": "scalar.loop", "rows": n, "seconds": secs, "rows_per_s": n / secs, "peak_bytes": peak_mem(run)}
+
+def bench_batch(n: int):
+    cols = make_inputs(n)
+    run = lambda: batch_ladders(**cols)
+    secs = best_of(run, repeat=3 if n <= 1_000_000 else 1)
+    return {"name": "batch.batch_ladders", "rows": n, "seconds": secs, "rows_per_s": n / secs, "peak_bytes": peak_mem(run)}
+
+# ---------- Persistence ----------
+def git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def load_previous(path: str, keep: int = RECENT_RUNS) -> dict:
+    # (name, rows) -> last `keep` results, oldest first
+    prev = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                r = json.loads(line)
+                runs = prev.setdefault((r["name"], r["rows"]), [])
+                runs.append(r)
+                del runs[:-keep]
+    except FileNotFoundError:
+        pass
+    return prev
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the scalar and vectorized ladder compute paths.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    ap.add_argument("--loop-rows", type=int, default=10_000, help="rows for the scalar per-row loop")
+    ap.add_argument("--results", default=RESULTS_FILE)
+    ap.add_argument("--no-save", action="store_true")
+    args = ap.parse_args(argv)
+
+    results = [bench_scalar(), bench_scalar_loop(args.loop_rows)] + [bench_batch(n) for n in args.sizes]
+    prev = load_previous(args.results)
+    stamp, rev = time.strftime("%Y-%m-%dT%H:%M:%S"), git_rev()
+    regressions = 0
+    for r in results:
+        r.update(timestamp=stamp, rev=rev)
+        old = prev.get((r["name"], r["rows"]))
+        flag = ""
+        if old:
+            base = float(np.median([o["seconds"] for o in old]))
+            tol = SUB_MS_TOL if base < 1e-3 else REGRESSION_TOL
+            if r["seconds"] > base * tol:
+                flag = f"  REGRESSION vs median of {len(old)} runs up to {old[-1]['rev']} ({base*1e3:.3f} ms)"
+                regressions += 1
+        print(f"{r['name']:<22} rows={r['rows']:>10,}  {r['seconds']*1e3:10.3f} ms  peak={r['peak_bytes']/2**20:8.1f} MiB{flag}")
+    if not args.no_save:
+        with open(args.results, "a") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
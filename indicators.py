@@ -0,0 +1,286 @@
+# indicators.py — Vectorized ATR / ADX / MACD / RSI from raw OHLCV, feeding the ladder inputs
+#
+# Timeframes follow the page labels: ATR and ADX on 4h bars, MACD and RSI-3 on 1h bars.
+
+import numpy as np
+import pandas as pd
+
+from ladder_core import compute_ladder
+
+# ---------- Constants ----------
+ATR_LEN = 14
+ADX_LEN = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+RSI_LEN = 3
+RSI_LEVELS = {"Crossed 20↑": 20.0, "Crossed 50↑": 50.0}
+OHLCV_ERROR = "Could not read OHLCV: need a timestamp column plus open, high, low, close, volume."
+
+# ---------- Loading / Resampling ----------
+def load_ohlcv(src) -> pd.DataFrame:
+    df = pd.read_csv(src)
+    df.columns = [c.strip().lower() for c in df.columns]
+    ts = next((c for c in ("timestamp", "time", "date", "datetime") if c in df.columns), None)
+    if ts is None or not {"open", "high", "low", "close", "volume"} <= set(df.columns):
+        raise ValueError(OHLCV_ERROR)
+    df[ts] = pd.to_datetime(df[ts], utc=True)
+    return df.set_index(ts).sort_index()[["open", "high", "low", "close", "volume"]]
+
+def resample(df: pd.DataFrame, rule: str = "4h") -> pd.DataFrame:
+    g = df.resample(rule, label="left", closed="left")
+    out = g.agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+    out = out[g.size() > 0]
+    # Drop a trailing bucket that hasn't closed yet
+    per_bar = pd.Timedelta(rule) // (df.index[1] - df.index[0]) if len(df) > 1 else 1
+    if len(out) and g.size().iloc[-1] < per_bar:
+        out = out.iloc[:-1]
+    return out
+
+# ---------- Smoothing Kernels ----------
+def wilder(s: pd.Series, n: int) -> pd.Series:
+    # Wilder's RMA: SMA of the first n valid values, then x_t = x_{t-1} + (v_t - x_{t-1}) / n
+    first = s.first_valid_index()
+    if first is None:
+        return s * np.nan
+    start = s.index.get_loc(first)
+    seeded = pd.Series(np.nan, index=s.index)
+    if start + n > len(s):
+        return seeded
+    seeded.iloc[start + n - 1] = s.iloc[start:start + n].mean()
+    seeded.iloc[start + n:] = s.iloc[start + n:]
+    return seeded.ewm(alpha=1.0 / n, adjust=False).mean()
+
+def ema(s: pd.Series, n: int) -> pd.Series:
+    return s.ewm(span=n, adjust=False).mean()
+
+# ---------- Indicators ----------
+def true_range(df: pd.DataFrame) -> pd.Series:
+    prev_close = df["close"].shift()
+    return pd.concat([df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()], axis=1).max(axis=1, skipna=False)
+
+def atr(df: pd.DataFrame, n: int = ATR_LEN) -> pd.Series:
+    return wilder(true_range(df), n)
+
+def adx(df: pd.DataFrame, n: int = ADX_LEN) -> pd.Series:
+    up, down = df["high"].diff(), -df["low"].diff()
+    plus_dm = pd.Series(np.where((up > down) & (up > 0), up, 0.0), index=df.index).where(up.notna())
+    minus_dm = pd.Series(np.where((down > up) & (down > 0), down, 0.0), index=df.index).where(down.notna())
+    tr = wilder(true_range(df), n)
+    plus_di = 100 * wilder(plus_dm, n) / tr
+    minus_di = 100 * wilder(minus_dm, n) / tr
+    di_sum = (plus_di + minus_di).replace(0.0, np.nan)
+    dx = (100 * (plus_di - minus_di).abs() / di_sum).fillna(0.0).where(plus_di.notna())
+    return wilder(dx, n)
+
+def macd(close: pd.Series, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL) -> pd.DataFrame:
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return pd.DataFrame({"macd": line, "signal": sig, "hist": line - sig})
+
+def macd_state(hist: pd.Series) -> pd.Series:
+    return pd.Series(np.select([hist > 0, hist < 0], ["Bullish", "Bearish"], "Neutral"), index=hist.index)
+
+def rsi(close: pd.Series, n: int = RSI_LEN) -> pd.Series:
+    delta = close.diff()
+    gain, loss = wilder(delta.clip(lower=0), n), wilder((-delta).clip(lower=0), n)
+    rs = gain / loss
+    return (100 - 100 / (1 + rs)).where(loss != 0, 100.0).where(gain.notna())
+
+def crossed_up(s: pd.Series, level: float) -> pd.Series:
+    return (s.shift() < level) & (s >= level)
+
+def rsi_trigger(close: pd.Series, n: int = RSI_LEN) -> pd.Series:
+    # Label per bar as the page's RSI-3 selectbox does; a 20↑ cross takes precedence
+    r = rsi(close, n)
+    out = np.select([crossed_up(r, 20.0), crossed_up(r, 50.0)], ["Crossed 20↑", "Crossed 50↑"], "None")
+    return pd.Series(out, index=close.index)
+
+# ---------- Ladder Inputs ----------
+def ladder_inputs(ohlcv_1h: pd.DataFrame) -> dict:
+    # Latest closed-bar values for the page: market, ATR (4h), ADX (4h), MACD state (1h), RSI-3 trigger (1h)
+    h4 = resample(ohlcv_1h, "4h")
+    if len(h4) < 2 * ADX_LEN or len(ohlcv_1h) < MACD_SLOW + MACD_SIGNAL:
+        raise ValueError(f"Need at least {2 * ADX_LEN} closed 4h bars of history to compute ADX-{ADX_LEN}.")
+    return {
+        "market": float(ohlcv_1h["close"].iloc[-1]),
+        "atr": float(atr(h4).iloc[-1]),
+        "adx": float(adx(h4).iloc[-1]),
+        "macd": str(macd_state(macd(ohlcv_1h["close"])["hist"]).iloc[-1]),
+        "rsi_trigger": str(rsi_trigger(ohlcv_1h["close"]).iloc[-1]),
+    }
+
+def indicator_frame(ohlcv_1h: pd.DataFrame) -> pd.DataFrame:
+    # Per-1h-bar ladder inputs using only bars closed by that bar's close (no lookahead):
+    # a 4h value becomes visible once its last 1h bar has closed.
+    h4 = resample(ohlcv_1h, "4h")
+    h4_vals = pd.DataFrame({"atr": atr(h4).to_numpy(), "adx": adx(h4).to_numpy()},
+                           index=h4.index + pd.Timedelta("4h"))
+    step = ohlcv_1h.index[1] - ohlcv_1h.index[0] if len(ohlcv_1h) > 1 else pd.Timedelta("1h")
+    closes_at = ohlcv_1h.index + step
+    out = h4_vals.reindex(closes_at, method="ffill")
+    out.index = ohlcv_1h.index
+    out["market"] = ohlcv_1h["close"]
+    out["macd"] = macd_state(macd(ohlcv_1h["close"])["hist"])
+    out["rsi_trigger"] = rsi_trigger(ohlcv_1h["close"])
+    return out[["market", "atr", "adx", "macd", "rsi_trigger"]]
+
+# ---------- Incremental (O(1) per bar) ----------
+# Same seeding and recurrences as the vectorized kernels above, so a live
+# series matches a full-history recompute bar for bar.
+class WilderRMA:
+    __slots__ = ("n", "count", "total", "value")
+
+    def __init__(self, n: int):
+        self.n, self.count, self.total, self.value = n, 0, 0.0, None
+
+    def update(self, v: float):
+        if self.value is None:
+            self.count += 1
+            self.total += v
+            if self.count == self.n:
+                self.value = self.total / self.n
+        else:
+            self.value += (v - self.value) / self.n
+        return self.value
+
+class EMA:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, n: int):
+        self.alpha, self.value = 2.0 / (n + 1), None
+
+    def update(self, v: float) -> float:
+        self.value = v if self.value is None else self.value + self.alpha * (v - self.value)
+        return self.value
+
+class ATRState:
+    __slots__ = ("prev_close", "rma")
+
+    def __init__(self, n: int = ATR_LEN):
+        self.prev_close, self.rma = None, WilderRMA(n)
+
+    def update(self, high: float, low: float, close: float):
+        prev, self.prev_close = self.prev_close, close
+        if prev is None:
+            return None
+        return self.rma.update(max(high - low, abs(high - prev), abs(low - prev)))
+
+class ADXState:
+    __slots__ = ("prev_high", "prev_low", "prev_close", "tr", "plus", "minus", "dx")
+
+    def __init__(self, n: int = ADX_LEN):
+        self.prev_high = self.prev_low = self.prev_close = None
+        self.tr, self.plus, self.minus, self.dx = WilderRMA(n), WilderRMA(n), WilderRMA(n), WilderRMA(n)
+
+    @property
+    def value(self):
+        return self.dx.value
+
+    def update(self, high: float, low: float, close: float):
+        ph, pl, pc = self.prev_high, self.prev_low, self.prev_close
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+        if pc is None:
+            return None
+        up, down = high - ph, pl - low
+        tr = self.tr.update(max(high - low, abs(high - pc), abs(low - pc)))
+        plus = self.plus.update(up if up > down and up > 0 else 0.0)
+        minus = self.minus.update(down if down > up and down > 0 else 0.0)
+        if tr is None:
+            return None
+        plus_di, minus_di = 100 * plus / tr, 100 * minus / tr
+        di_sum = plus_di + minus_di
+        return self.dx.update(100 * abs(plus_di - minus_di) / di_sum if di_sum != 0 else 0.0)
+
+class MACDState:
+    __slots__ = ("fast", "slow", "signal", "hist")
+
+    def __init__(self, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+        self.fast, self.slow, self.signal, self.hist = EMA(fast), EMA(slow), EMA(signal), None
+
+    @property
+    def state(self) -> str:
+        if self.hist is None or self.hist == 0:
+            return "Neutral"
+        return "Bullish" if self.hist > 0 else "Bearish"
+
+    def update(self, close: float) -> str:
+        line = self.fast.update(close) - self.slow.update(close)
+        self.hist = line - self.signal.update(line)
+        return self.state
+
+class RSIState:
+    __slots__ = ("prev_close", "gain", "loss", "value", "trigger")
+
+    def __init__(self, n: int = RSI_LEN):
+        self.prev_close, self.gain, self.loss = None, WilderRMA(n), WilderRMA(n)
+        self.value, self.trigger = None, "None"
+
+    def update(self, close: float) -> str:
+        prev, self.prev_close = self.prev_close, close
+        if prev is None:
+            return self.trigger
+        delta = close - prev
+        gain, loss = self.gain.update(max(delta, 0.0)), self.loss.update(max(-delta, 0.0))
+        last = self.value
+        self.value = None if gain is None else (100.0 if loss == 0 else 100 - 100 / (1 + gain / loss))
+        self.trigger = "None"
+        if last is not None and self.value is not None:
+            for label, level in RSI_LEVELS.items():
+                if last < level <= self.value:
+                    self.trigger = label
+                    break
+        return self.trigger
+
+class LiveIndicators:
+    # Feed closed 1h bars; 4h bars for ATR/ADX are aggregated on the fly.
+    __slots__ = ("atr", "adx", "macd", "rsi", "market", "_bucket", "_bar", "_count")
+    H4_SECONDS = 4 * 3600
+
+    def __init__(self):
+        self.atr, self.adx, self.macd, self.rsi = ATRState(), ADXState(), MACDState(), RSIState()
+        self.market, self._bucket, self._bar, self._count = None, None, None, 0
+
+    def _close_4h(self):
+        _, high, low, close = self._bar
+        self.atr.update(high, low, close)
+        self.adx.update(high, low, close)
+        self._bar, self._count = None, 0
+
+    def on_bar(self, ts, open_: float, high: float, low: float, close: float):
+        bucket = int(pd.Timestamp(ts).timestamp()) // self.H4_SECONDS
+        if self._bar is not None and bucket != self._bucket:
+            self._close_4h()
+        if self._bar is None:
+            self._bucket, self._bar = bucket, [open_, high, low, close]
+        else:
+            b = self._bar
+            b[1], b[2], b[3] = max(b[1], high), min(b[2], low), close
+        self._count += 1
+        if self._count == 4:
+            self._close_4h()
+        self.market = close
+        self.macd.update(close)
+        self.rsi.update(close)
+
+    @property
+    def ready(self) -> bool:
+        return self.atr.rma.value is not None and self.adx.value is not None
+
+    def inputs(self) -> dict:
+        return {"market": self.market, "atr": self.atr.rma.value, "adx": self.adx.value,
+                "macd": self.macd.state, "rsi_trigger": self.rsi.trigger}
+
+class LiveLadder:
+    # Re-derives the ladder from live indicators each time a 1h bar closes.
+    __slots__ = ("side", "zone_upper", "zone_lower", "sl_buf", "ind", "result")
+
+    def __init__(self, side: str, zone_upper: float, zone_lower: float, sl_buf: float = 1.0):
+        self.side, self.zone_upper, self.zone_lower, self.sl_buf = side, zone_upper, zone_lower, sl_buf
+        self.ind, self.result = LiveIndicators(), None
+
+    def on_bar(self, ts, open_: float, high: float, low: float, close: float):
+        self.ind.on_bar(ts, open_, high, low, close)
+        if self.ind.ready:
+            i = self.ind.inputs()
+            self.result = compute_ladder(self.side, i["market"], self.zone_upper, self.zone_lower,
+                                         i["atr"], i["adx"], i["macd"], self.sl_buf, i["rsi_trigger"])
+        return self.result
@@ -0,0 +1,129 @@
+# instruments.py — Per-symbol tick/lot metadata with O(1) lookup and vectorized snapping
+#
+# Rounding is directional so snapping never makes a ladder more aggressive than computed:
+# long prices round down (buys no higher, stop no tighter, target no further), short prices
+# round up. Quantities round down to the lot size and drop below min notional.
+
+import numpy as np
+import pandas as pd
+
+META_COLUMNS = ("tick_size", "lot_size", "min_notional")
+PRICE_FIELDS = ("L0", "L1", "L2", "sl", "tp")
+
+# ---------- Index ----------
+class InstrumentIndex:
+    def __init__(self, meta: pd.DataFrame):
+        # meta: one row per symbol with tick_size, lot_size and optional min_notional
+        meta = meta.drop_duplicates("symbol", keep="last")
+        self._index = pd.Index(meta["symbol"].astype(str))  # hash table: get_indexer is O(1) per symbol
+        self.tick = meta["tick_size"].to_numpy(np.float64)
+        self.lot = meta["lot_size"].to_numpy(np.float64) if "lot_size" in meta else np.zeros(len(meta))
+        self.min_notional = meta["min_notional"].fillna(0.0).to_numpy(np.float64) if "min_notional" in meta else np.zeros(len(meta))
+
+    @classmethod
+    def from_csv(cls, path: str) -> "InstrumentIndex":
+        meta = pd.read_csv(path)
+        meta.columns = [c.strip().lower() for c in meta.columns]
+        return cls(meta)
+
+    def __len__(self): return len(self._index)
+
+    def rows(self, symbols, valid=None) -> np.ndarray:
+        # valid: optional mask; rows outside it (rejected ladders, blank template rows) aren't
+        # looked up and come back as -1, which take() maps to 0 = no snapping
+        symbols = np.asarray(symbols, dtype=str)
+        need = np.ones(symbols.shape, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        rows = np.full(symbols.shape, -1, dtype=np.intp)
+        rows[need] = self._index.get_indexer(symbols[need])
+        if (rows[need] < 0).any():
+            missing = symbols[need & (rows < 0)][:5]
+            raise KeyError(f"No instrument metadata for: {', '.join(map(str, missing))}")
+        return rows
+
+    def take(self, values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        # Per-row tick/lot/min_notional, 0.0 where rows() skipped the lookup
+        return np.where(rows >= 0, values[rows], 0.0) if len(values) else np.zeros(rows.shape)
+
+    def get(self, symbol: str) -> dict:
+        i = self._index.get_loc(symbol)
+        return {"tick_size": self.tick[i], "lot_size": self.lot[i], "min_notional": self.min_notional[i]}
+
+# ---------- Snapping ----------
+def _decimals(step):
+    # Decimal places of each tick/lot (0.25 -> 2, 0.125 -> 3, 1e-10 -> 10), to wash out float
+    # residue after rounding: the smallest d for which step × 10^d is a whole number, capped at 15.
+    # The tolerance is relative, so sub-nano steps aren't mistaken for whole at d=0.
+    scaled = np.asarray(step, dtype=np.float64)[..., None] * 10.0 ** np.arange(16)
+    whole = np.abs(scaled - np.round(scaled)) <= 1e-9 * scaled
+    return np.where(whole.any(-1), whole.argmax(-1), 15)
+
+def _on_grid(units):
+    # Float residue (0.5 / 1e-9 = 499999999.99999994) shouldn't push a price that is already on a
+    # tick to the next one: values within 1e-9 ticks, or 1e-12 relative for huge counts, snap to it
+    near = np.round(units)
+    return np.where(np.abs(units - near) <= np.maximum(1e-9, 1e-12 * np.abs(units)), near, units)
+
+def snap_prices(prices, tick, round_down):
+    # prices (..., k) or (...,); tick/round_down broadcast over the leading axes
+    prices = np.asarray(prices, dtype=np.float64)
+    tick = np.asarray(tick, dtype=np.float64)
+    down = np.asarray(round_down)
+    if prices.ndim > tick.ndim:
+        tick, down = tick[..., None], down[..., None]
+    safe = np.where(tick > 0, tick, 1.0)
+    units = _on_grid(prices / safe)
+    units = np.where(down, np.floor(units), np.ceil(units))
+    snapped = units * safe
+    dec = np.broadcast_to(_decimals(tick), snapped.shape)  # per tick, not per price
+    snapped = np.where(tick > 0, snapped, prices)
+    # np.round takes a scalar decimals argument, so round per distinct tick precision
+    for d in np.unique(dec):
+        m = dec == d
+        snapped[m] = np.round(snapped[m], int(d))
+    return snapped
+
+def snap_ladders(ladders: np.ndarray, symbols, side, index: InstrumentIndex, market=None) -> np.ndarray:
+    # Returns a copy of a LADDER_DTYPE array with levels, SL and TP on each symbol's tick.
+    # With `market`, reward:risk is recomputed from the snapped SL/TP.
+    tick = index.take(index.tick, index.rows(symbols, ladders["valid"]))
+    is_long = np.asarray(side) == "Long"
+    out = ladders.copy()
+    prices = np.stack([ladders[f] for f in PRICE_FIELDS], axis=-1)
+    snapped = snap_prices(prices, tick, is_long)
+    for j, f in enumerate(PRICE_FIELDS):
+        out[f] = snapped[..., j]
+    if market is not None:
+        # R:R against the snapped market-level entry, so it matches the displayed L0
+        market = snap_prices(market, tick, is_long)
+        out["rr"] = np.where(is_long,
+                             (out["tp"] - market) / np.maximum(market - out["sl"], 1e-12),
+                             (market - out["tp"]) / np.maximum(out["sl"] - market, 1e-12))
+    return out
+
+def snap_quantities(qty, prices, symbols, index: InstrumentIndex):
+    # qty/prices (N, k): floor to lot size, zero out orders below min notional.
+    # Rows without any priced level (rejected ladders) need no metadata.
+    rows = index.rows(symbols, np.isfinite(prices).any(1))
+    lot, min_notional = index.take(index.lot, rows)[:, None], index.take(index.min_notional, rows)[:, None]
+    safe = np.where(lot > 0, lot, 1.0)
+    q = np.where(lot > 0, np.floor(_on_grid(np.asarray(qty) / safe)) * safe, qty)
+    for d in np.unique(_decimals(lot)):
+        m = np.broadcast_to(_decimals(lot) == d, q.shape)
+        q[m] = np.round(q[m], int(d))
+    return np.where(np.nan_to_num(q * prices) >= min_notional, q, 0.0)
+
+# ---------- DataFrame Front-end ----------
+def snap_frame(out: pd.DataFrame, index: InstrumentIndex, market=None) -> pd.DataFrame:
+    # Snap the price columns of a batch_frame / grid_frame result; invalid rows stay NaN
+    out = out.copy()
+    cols = [c for c in out.columns if c in PRICE_FIELDS or (c[:1] == "L" and c[1:].isdigit())]
+    is_long = out["side"].to_numpy(dtype=str) == "Long"
+    valid = out["valid"].to_numpy() if "valid" in out else None
+    tick = index.take(index.tick, index.rows(out["symbol"].astype(str).to_numpy(), valid))
+    out[cols] = snap_prices(out[cols].to_numpy(np.float64), tick, is_long)
+    if market is not None and {"sl", "tp", "rr"} <= set(out.columns):
+        market = snap_prices(market, tick, is_long)  # the snapped market-level entry
+        sl, tp = out["sl"].to_numpy(), out["tp"].to_numpy()
+        out["rr"] = np.where(is_long, (tp - market) / np.maximum(market - sl, 1e-12),
+                             (market - tp) / np.maximum(sl - market, 1e-12))
+    return out
@@ -1,8 +1,48 @@
 # ladder_calculator.py — Final Visual Polished Ladder Calculator
 
+import io
+import os
+
+import pandas as pd
 import streamlit as st
 
+from indicators import ladder_inputs, load_ohlcv
+from instruments import InstrumentIndex, snap_frame, snap_quantities
+from ladder_batch import batch_frame, normalize_columns
+from ladder_core import DEC, TP_MULT, compute_ladder, deltas_from_market
+from ladder_history import HistoryStore
+from monte_carlo import simulate_ladder
+from sizing import SCHEMES, size_ladders
+from ui_perf import PerfPanel
+
 st.set_page_config(page_title="Ladder Calculator", page_icon="📊", layout="centered")
+perf = PerfPanel()
+
+def stop():
+    perf.finish()
+    st.stop()
+
+# Identical inputs across reruns and users are served from cache
+@st.cache_data(max_entries=2048, ttl=600, show_spinner=False)
+def cached_ladder(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger):
+    return compute_ladder(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger)
+
+@st.cache_data(max_entries=512, ttl=600, show_spinner=False)
+def cached_outcomes(res, atr):
+    return simulate_ladder(res, atr)
+
+# Instrument metadata is indexed once per uploaded file and shared across reruns
+@st.cache_resource(max_entries=4, show_spinner=False)
+def instrument_index(data: bytes):
+    return InstrumentIndex.from_csv(io.BytesIO(data))
+
+# One history writer per server process; recording only enqueues, so the click never waits on disk
+@st.cache_resource(show_spinner=False)
+def history():
+    return HistoryStore(os.environ.get("LADDER_HISTORY_DB", "ladder_history.db"))
+
+def current_user():
+    return st.experimental_user.get("email") or os.environ.get("USER", "")
 
 # ---------- CSS ----------
 st.markdown("""
@@ -44,127 +84,100 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ---------- Constants ----------
-DEC = 4
-BASE_STEP_MULT = 0.5
-NUDGE_MULT = 0.25
-TP_MULT = 2.0
-
-# ---------- Helper Functions ----------
-def ladder_count(zone_w: float, atr_val: float, adx_val: float):
-    if atr_val <= 0:
-        return 2, 0.0
-    k = zone_w / atr_val
-    base = 2 if k < 1.2 else 3
-    if adx_val >= 25:
-        base = max(2, base - 1)
-    return base, k
-
-def macd_nudged_step(side: str, base_step: float, macd_state: str, atr_val: float) -> float:
-    if macd_state == "Neutral": return base_step
-    if side == "Long":
-        return max(0.0, base_step - NUDGE_MULT*atr_val) if macd_state == "Bullish" else (base_step + NUDGE_MULT*atr_val)
-    else:
-        return max(0.0, base_step - NUDGE_MULT*atr_val) if macd_state == "Bearish" else (base_step + NUDGE_MULT*atr_val)
-
-def clamp(x, lo, hi): return max(lo, min(hi, x))
-
-def deltas_from_market(px: float, mkt: float, side: str):
-    d = abs(px - mkt)
-    pct = (d / mkt * 100) if mkt > 0 else 0.0
-    where = ("below" if px < mkt else "above") if side == "Long" else ("above" if px > mkt else "below")
-    return d, pct, where
+perf.mark("setup")
 
 # ---------- Title ----------
 st.markdown("# Ladder Calculator")
 st.markdown("<div class='subtitle'>Dynamic Ladder Mapping for Smarter Positioning</div>", unsafe_allow_html=True)
 
-# ============= 1️⃣ Direction =============
-with st.container(border=True):
-    st.markdown("### **Direction**")
-    side = st.radio("Direction", ["Long", "Short"], horizontal=True, label_visibility="collapsed")
-
-# ============= 2️⃣ Market Structure =============
-with st.container(border=True):
-    st.markdown("### **Market Structure**")
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.markdown("**Market Price**")
-        market = st.number_input("Market Price", min_value=0.0, format="%.4f", key="mkt", label_visibility="collapsed")
-    with c2:
-        st.markdown("**Upper Zone (UZ)**")
-        zone_upper = st.number_input("Upper Zone", min_value=0.0, format="%.4f", key="zu", label_visibility="collapsed")
-    with c3:
-        st.markdown("**Lower Zone (LZ)**")
-        zone_lower = st.number_input("Lower Zone", min_value=0.0, format="%.4f", key="zl", label_visibility="collapsed")
-
-# ============= 3️⃣ Technical Indicators (Horizontal Alignment) =============
-with st.container(border=True):
-    st.markdown("### **Technical Indicators**")
-    col1, col2, col3, col4 = st.columns([1,1,1,1])
-    # Left (Compulsory)
-    with col1:
-        st.markdown("**ATR (4h, 14)**")
-        atr = st.number_input("ATR", min_value=0.0, format="%.4f", key="atr", label_visibility="collapsed")
-    with col2:
-        st.markdown("**MACD (1h, 12-26-9)**")
-        macd = st.selectbox("MACD", ["Neutral", "Bullish", "Bearish"], label_visibility="collapsed")
-    # Right (Optional)
-    with col3:
-        st.markdown("**ADX (4h, 14) (Optional)**")
-        adx = st.number_input("ADX", min_value=0.0, value=0.0, step=0.5, format="%.2f", key="adx", label_visibility="collapsed")
-    with col4:
-        st.markdown("**RSI-3 Trigger (Optional)**")
-        rsi_trigger = st.selectbox("RSI-3", ["None", "Crossed 20↑", "Crossed 50↑"], label_visibility="collapsed")
-
-# ============= 4️⃣ Stop-Loss Buffer =============
-with st.container(border=True):
-    st.markdown("### **Stop-Loss Buffer**")
-    st.markdown("<div class='slbtn'>", unsafe_allow_html=True)
-    slbuf_choice = st.radio(
-        "Choose SL Buffer × ATR",
-        ["SL Buffer = 1.0 × ATR", "SL Buffer = 1.5 × ATR"],
-        horizontal=True, label_visibility="collapsed", index=0
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
-    sl_buf = 1.0 if "1.0" in slbuf_choice else 1.5
-
-calc = st.button("Calculate ladders")
-
-# ---------- Compute ----------
-if calc:
-    if market <= 0 or atr <= 0 or zone_upper <= 0 or zone_lower <= 0:
-        st.error("Please enter positive numbers for **Market**, **ATR**, **Upper Zone**, and **Lower Zone**.")
-        st.stop()
-    if zone_lower >= zone_upper:
-        st.error("**Lower Zone** must be less than **Upper Zone**.")
-        st.stop()
-    zone_w = zone_upper - zone_lower
-    ladders, k = ladder_count(zone_w, atr, adx)
-    base_step = BASE_STEP_MULT * atr
-    step = macd_nudged_step(side, base_step, macd, atr)
-    # Ladder levels
-    L = [market]
-    if side == "Long":
-        L1 = clamp(market - step, zone_lower, zone_upper); L.append(L1)
-        if ladders == 3:
-            L2 = clamp(L1 - step, zone_lower, zone_upper); L.append(L2)
-        # Sort ladders descending for consistent display (highest to lowest price)
-        L.sort(reverse=True)
-    else:
-        L1 = clamp(market + step, zone_lower, zone_upper); L.append(L1)
-        if ladders == 3:
-            L2 = clamp(L1 + step, zone_lower, zone_upper); L.append(L2)
-        # Sort ladders descending for consistent display (highest to lowest price)
-        L.sort(reverse=True)
-    # Stop loss and TP
-    if side == "Long":
-        sl = zone_lower - sl_buf*atr
-        tp = market + TP_MULT*atr
-    else:
-        sl = zone_upper + sl_buf*atr
-        tp = market - TP_MULT*atr
-    # ---------- Results ----------
+mode = st.radio("Mode", ["Single ladder", "Portfolio", "History"], horizontal=True, label_visibility="collapsed")
+
+# ============= History Mode =============
+if mode == "History":
+    h1, h2 = st.columns([2, 1])
+    symbol = h1.text_input("Symbol (blank = all)").strip()
+    days = h2.number_input("Last N days", min_value=0.1, value=7.0, step=1.0)
+    found = history().recent(symbol or None, days)
+    st.caption(f"{len(found)} ladder(s)" + (" (newest 1000 shown)" if len(found) == 1000 else ""))
+    st.dataframe(found, hide_index=True, use_container_width=True,
+                 column_config={c: st.column_config.NumberColumn(format=f"%.{DEC}f") for c in ["market", "L0", "L1", "L2", "sl", "tp", "step"]})
+    stop()
+
+# ============= Portfolio Mode =============
+if mode == "Portfolio":
+    with st.container(border=True):
+        st.markdown("### **Instruments**")
+        st.caption("Columns: symbol, side, market, zone_upper (UZ), zone_lower (LZ), atr, adx, macd, rsi_trigger")
+        upload = st.file_uploader("Upload CSV", type=["csv"], label_visibility="collapsed")
+        template = pd.read_csv(upload) if upload is not None else pd.DataFrame({
+            "symbol": [""], "side": ["Long"], "market": [0.0], "zone_upper": [0.0],
+            "zone_lower": [0.0], "atr": [0.0], "adx": [0.0], "macd": ["Neutral"], "rsi_trigger": ["None"],
+        })
+        meta_file = st.file_uploader("Instrument metadata CSV (symbol, tick_size, lot_size, min_notional) — optional", type=["csv"])
+        # Table edits are batched until submit instead of rerunning per cell
+        with st.form("portfolio_form", border=False):
+            table = st.data_editor(template, num_rows="dynamic", use_container_width=True, key="portfolio")
+            pf_buf = st.radio("SL Buffer", [1.0, 1.5], horizontal=True, format_func=lambda x: f"SL Buffer = {x:.1f} × ATR")
+            s1, s2, s3 = st.columns(3)
+            equity = s1.number_input("Account equity (0 = no sizing)", min_value=0.0, step=1000.0)
+            risk_pct = s2.number_input("Risk per trade %", min_value=0.0, max_value=100.0, value=1.0, step=0.25)
+            scheme = s3.selectbox("Allocation", list(SCHEMES), format_func=lambda x: x.replace("_", " ").title())
+            pf_calc = st.form_submit_button("Calculate ladders")
+    perf.mark("inputs")
+    if pf_calc:
+        try:
+            out = batch_frame(table, pf_buf)
+            index = instrument_index(meta_file.getvalue()) if meta_file is not None else None
+            if index is not None:
+                out = snap_frame(out, index, normalize_columns(table)["market"].to_numpy(float))
+        except (KeyError, ValueError) as e:
+            st.error(str(e))
+            stop()
+        if equity > 0:
+            sized = size_ladders(out[["L0", "L1", "L2"]].to_numpy(), out["sl"].to_numpy(), out["tp"].to_numpy(),
+                                 out["side"].to_numpy(dtype=str), equity, risk_pct / 100, scheme)
+            qty = sized["qty"]
+            if index is not None:
+                qty = snap_quantities(qty, out[["L0", "L1", "L2"]].to_numpy(), out["symbol"].astype(str).to_numpy(), index)
+            for j in range(3):
+                out[f"qty_L{j}"] = qty[:, j]
+            out["blended_entry"], out["blended_rr"] = sized["blended_entry"], sized["blended_rr"]
+        ok = out["valid"].to_numpy()
+        history().record_frame(normalize_columns(table)[ok], out[ok], pf_buf, current_user())
+        perf.mark("compute")
+        st.markdown("## Results")
+        if not out["valid"].all():
+            st.warning(f"{(~out['valid']).sum()} row(s) skipped: need positive Market, ATR and zones with LZ < UZ.")
+        st.dataframe(out[out["valid"]].drop(columns="valid"), hide_index=True, use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format=f"%.{DEC}f") for c in ["L0", "L1", "L2", "sl", "tp", "step", "blended_entry"]})
+        perf.mark("results")
+    stop()
+
+# ============= Indicators from OHLCV (Optional) =============
+with st.expander("Fill Market Price and indicators from a 1h OHLCV file"):
+    ohlcv_file = st.file_uploader("OHLCV CSV (timestamp, open, high, low, close, volume)", type=["csv"])
+    # Prefill the widgets once per uploaded file so manual edits afterwards stick
+    if ohlcv_file is not None and st.session_state.get("ohlcv_id") != ohlcv_file.file_id:
+        try:
+            ind = ladder_inputs(load_ohlcv(ohlcv_file))
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.session_state.update(mkt=ind["market"], atr=ind["atr"], adx=ind["adx"], macd=ind["macd"], rsi=ind["rsi_trigger"],
+                                    ohlcv_id=ohlcv_file.file_id)
+            st.caption(f"ATR {ind['atr']:.{DEC}f} • ADX {ind['adx']:.2f} • MACD {ind['macd']} • RSI-3 {ind['rsi_trigger']}")
+
+# ---------- Results ----------
+def render_results(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger, symbol="", timer=perf):
+    try:
+        res = cached_ladder(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    history().record(res, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger, symbol, current_user())
+    L, sl, tp, rr = res.levels, res.sl, res.tp, res.rr
+    zone_w, ladders, k, base_step, step = res.zone_w, res.ladders, res.k, res.base_step, res.step
+    timer.mark("compute")
     st.markdown("## Results")
     cols = st.columns(len(L))
     for i, px in enumerate(L):
@@ -177,7 +190,6 @@ if calc:
             st.markdown(f"<div class='valbox val-blue'><strong>{px:.{DEC}f}</strong></div>", unsafe_allow_html=True)
             st.caption(f"Δ {d:.{DEC}f} ({pct:.2f}%), {where} market")
     st.divider()
-    rr = ((tp - market) / max(market - sl, 1e-12)) if side == "Long" else ((market - tp) / max(sl - market, 1e-12))
     a, b, c = st.columns(3)
     with a:
         st.markdown("<h3>Stop Loss</h3>", unsafe_allow_html=True)
@@ -190,9 +202,83 @@ if calc:
     with c:
         st.markdown("<h3>Reward : Risk</h3>", unsafe_allow_html=True)
         st.markdown(f"<div class='valbox val-blue'><strong>{rr:.2f} : 1</strong></div>", unsafe_allow_html=True)
+        mc = cached_outcomes(res, atr)
+        st.caption(f"Monte Carlo: TP before SL {mc['p_tp_first']:.0%} • E[R] {mc['expected_r']:+.2f}")
     st.divider()
     st.caption(
         f"Zone width = {zone_w:.{DEC}f} • ATR = {atr:.{DEC}f} • "
         f"k = {k:.2f} • Ladders = {ladders} • "
         f"Base step = {base_step:.{DEC}f} • MACD step = {step:.{DEC}f}"
     )
+    timer.mark("results")
+
+# ============= Single Ladder =============
+# Inputs only submit on "Calculate ladders", and the form plus results rerun as one
+# fragment, so a submit doesn't re-execute the CSS, title or uploader above.
+@st.fragment
+def single_ladder():
+    # A Calculate click reruns only this fragment, after the full run's panel has finished,
+    # so that rerun gets its own panel, rendered inline below the results.
+    timer = PerfPanel() if perf.finished else perf
+    with st.form("ladder_form", border=False):
+        # ============= 1️⃣ Direction =============
+        with st.container(border=True):
+            st.markdown("### **Direction**")
+            d1, d2 = st.columns([2, 1])
+            side = d1.radio("Direction", ["Long", "Short"], horizontal=True, label_visibility="collapsed")
+            symbol = d2.text_input("Symbol", key="sym", placeholder="Symbol (optional)", label_visibility="collapsed").strip()
+
+        # ============= 2️⃣ Market Structure =============
+        with st.container(border=True):
+            st.markdown("### **Market Structure**")
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                st.markdown("**Market Price**")
+                market = st.number_input("Market Price", min_value=0.0, format="%.4f", key="mkt", label_visibility="collapsed")
+            with c2:
+                st.markdown("**Upper Zone (UZ)**")
+                zone_upper = st.number_input("Upper Zone", min_value=0.0, format="%.4f", key="zu", label_visibility="collapsed")
+            with c3:
+                st.markdown("**Lower Zone (LZ)**")
+                zone_lower = st.number_input("Lower Zone", min_value=0.0, format="%.4f", key="zl", label_visibility="collapsed")
+
+        # ============= 3️⃣ Technical Indicators (Horizontal Alignment) =============
+        with st.container(border=True):
+            st.markdown("### **Technical Indicators**")
+            col1, col2, col3, col4 = st.columns([1,1,1,1])
+            # Left (Compulsory)
+            with col1:
+                st.markdown("**ATR (4h, 14)**")
+                atr = st.number_input("ATR", min_value=0.0, format="%.4f", key="atr", label_visibility="collapsed")
+            with col2:
+                st.markdown("**MACD (1h, 12-26-9)**")
+                macd = st.selectbox("MACD", ["Neutral", "Bullish", "Bearish"], key="macd", label_visibility="collapsed")
+            # Right (Optional)
+            with col3:
+                st.markdown("**ADX (4h, 14) (Optional)**")
+                adx = st.number_input("ADX", min_value=0.0, step=0.5, format="%.2f", key="adx", label_visibility="collapsed")
+            with col4:
+                st.markdown("**RSI-3 Trigger (Optional)**")
+                rsi_trigger = st.selectbox("RSI-3", ["None", "Crossed 20↑", "Crossed 50↑"], key="rsi", label_visibility="collapsed")
+
+        # ============= 4️⃣ Stop-Loss Buffer =============
+        with st.container(border=True):
+            st.markdown("### **Stop-Loss Buffer**")
+            st.markdown("<div class='slbtn'>", unsafe_allow_html=True)
+            slbuf_choice = st.radio(
+                "Choose SL Buffer × ATR",
+                ["SL Buffer = 1.0 × ATR", "SL Buffer = 1.5 × ATR"],
+                horizontal=True, label_visibility="collapsed", index=0
+            )
+            st.markdown("</div>", unsafe_allow_html=True)
+            sl_buf = 1.0 if "1.0" in slbuf_choice else 1.5
+
+        calc = st.form_submit_button("Calculate ladders")
+    timer.mark("inputs")
+    if calc:
+        render_results(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger, symbol, timer)
+    if timer is not perf:
+        timer.finish(st.container())
+
+single_ladder()
+perf.finish()
@@ -0,0 +1,125 @@
+# ladder_api.py — ASGI HTTP service for the ladder calculator
+#
+#   uvicorn ladder_api:app --host 0.0.0.0 --port 8000
+
+import os
+from contextlib import asynccontextmanager
+from typing import Literal
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from pydantic import BaseModel
+
+from ladder_batch import batch_ladders
+from ladder_cache import cached_compute_ladder
+from ladder_history import HistoryStore
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Opened per server start, so importing this module doesn't create the DB or a writer thread
+    app.state.history = HistoryStore(os.environ.get("LADDER_HISTORY_DB", "ladder_history.db"))
+    yield
+    app.state.history.close()
+
+app = FastAPI(title="Ladder Calculator API", lifespan=lifespan)
+
+Side = Literal["Long", "Short"]
+Macd = Literal["Neutral", "Bullish", "Bearish"]
+RsiTrigger = Literal["None", "Crossed 20↑", "Crossed 50↑"]
+
+# ---------- Schemas ----------
+class LadderRequest(BaseModel):
+    side: Side
+    market: float
+    zone_upper: float
+    zone_lower: float
+    atr: float
+    adx: float = 0.0
+    macd: Macd = "Neutral"
+    sl_buf: float = 1.0
+    rsi_trigger: RsiTrigger = "None"
+    symbol: str = ""
+    user: str = ""
+
+class LadderResponse(BaseModel):
+    side: Side
+    market: float
+    levels: list[float]
+    sl: float
+    tp: float
+    rr: float
+    k: float
+    ladders: int
+    zone_w: float
+    base_step: float
+    step: float
+
+class BatchRequest(BaseModel):
+    side: list[Side]
+    market: list[float]
+    zone_upper: list[float]
+    zone_lower: list[float]
+    atr: list[float]
+    adx: list[float] | None = None
+    macd: list[Macd] | None = None
+    sl_buf: float | list[float] = 1.0
+    rsi_trigger: list[RsiTrigger] | None = None
+
+class BatchResponse(BaseModel):
+    # Column-oriented; rows the calculator rejects have valid=false and null values
+    L0: list[float | None]
+    L1: list[float | None]
+    L2: list[float | None]
+    sl: list[float | None]
+    tp: list[float | None]
+    rr: list[float | None]
+    k: list[float | None]
+    ladders: list[int]
+    step: list[float | None]
+    valid: list[bool]
+
+def _column(arr: np.ndarray) -> list:
+    return [None if v != v else v for v in arr.tolist()]
+
+# ---------- Endpoints ----------
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.post("/ladder", response_model=LadderResponse)
+async def ladder(req: LadderRequest, request: Request):
+    try:
+        res = cached_compute_ladder(req.side, req.market, req.zone_upper, req.zone_lower,
+                                    req.atr, req.adx, req.macd, req.sl_buf, req.rsi_trigger)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e).replace("**", ""))
+    request.app.state.history.record(res, req.zone_upper, req.zone_lower, req.atr, req.adx, req.macd,
+                                     req.sl_buf, req.rsi_trigger, req.symbol, req.user)
+    return LadderResponse(**{f: getattr(res, f) for f in LadderResponse.model_fields})
+
+# Plain def: a large batch is CPU-bound, so it runs in the threadpool (NumPy releases the GIL
+# in the heavy ops) instead of stalling concurrent /ladder calls on the event loop.
+# /ladder stays async; one scalar ladder costs less than a threadpool hop.
+@app.post("/ladders", response_model=BatchResponse)
+def ladders(req: BatchRequest):
+    n = len(req.market)
+    lengths = {len(req.side), n, len(req.zone_upper), len(req.zone_lower), len(req.atr)}
+    lengths |= {len(c) for c in (req.adx, req.macd, req.rsi_trigger) if c is not None}
+    if isinstance(req.sl_buf, list):
+        lengths.add(len(req.sl_buf))
+    if len(lengths) != 1:
+        raise HTTPException(status_code=422, detail="All array fields must have the same length.")
+    res = batch_ladders(req.side, req.market, req.zone_upper, req.zone_lower, req.atr,
+                        req.adx if req.adx is not None else 0.0,
+                        req.macd if req.macd is not None else "Neutral", req.sl_buf,
+                        rsi_trigger=req.rsi_trigger if req.rsi_trigger is not None else "None")
+    out = {f: _column(res[f]) for f in ("L0", "L1", "L2", "sl", "tp", "rr", "k", "step")}
+    return BatchResponse(**out, ladders=res["ladders"].tolist(), valid=res["valid"].tolist())
+
+@app.get("/history")
+def ladder_history(request: Request, symbol: str | None = None, days: float = Query(7.0, gt=0),
+                   limit: int = Query(1000, gt=0, le=10_000)):
+    # Recorded ladder computations (page and API), newest first; plain def keeps the SQLite read off the event loop
+    df = request.app.state.history.recent(symbol, days, limit)
+    df["ts"] = df["ts"].map(lambda t: t.isoformat())
+    return df.astype(object).where(df.notna(), None).to_dict("records")
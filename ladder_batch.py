@@ -0,0 +1,166 @@
+# ladder_batch.py — Vectorized ladder engine: one NumPy pass over many instruments
+
+import numpy as np
+
+from ladder_core import ADX_TREND, BASE_STEP_MULT, DEFAULT_PARAMS, K_SPLIT, NUDGE_MULT, RSI_MOMENTUM, LadderParams
+
+# ---------- Result dtype ----------
+LADDER_DTYPE = np.dtype([
+    ("L0", "f8"), ("L1", "f8"), ("L2", "f8"),
+    ("sl", "f8"), ("tp", "f8"), ("rr", "f8"), ("k", "f8"),
+    ("ladders", "i1"), ("base_step", "f8"), ("step", "f8"), ("valid", "?"),
+])
+
+# ---------- Vectorized Rules ----------
+def ladder_count_v(zone_w, atr_val, adx_val, k_split: float = K_SPLIT, adx_trend: float = ADX_TREND):
+    safe_atr = np.where(atr_val > 0, atr_val, 1.0)
+    k = np.where(atr_val > 0, zone_w / safe_atr, 0.0)
+    base = np.where(k < k_split, 2, 3)
+    base = np.where(adx_val >= adx_trend, np.maximum(2, base - 1), base)
+    return np.where(atr_val > 0, base, 2), k
+
+def macd_nudged_step_v(is_long, base_step, macd_state, atr_val, nudge_mult: float = NUDGE_MULT):
+    tighter = np.maximum(0.0, base_step - nudge_mult*atr_val)
+    wider = base_step + nudge_mult*atr_val
+    with_trend = np.where(is_long, macd_state == "Bullish", macd_state == "Bearish")
+    return np.where(macd_state == "Neutral", base_step, np.where(with_trend, tighter, wider))
+
+def rsi_gated_count_v(ladders, rsi_trigger, is_long=True):
+    return np.where(is_long & (rsi_trigger == RSI_MOMENTUM), np.minimum(ladders, 2), ladders)
+
+def clamp_v(x, lo, hi): return np.maximum(lo, np.minimum(hi, x))
+
+def walk_levels(is_long, market, zone_lower, zone_upper, steps):
+    # Closed form of L_i = clamp(L_{i-1} ∓ step_i) for non-negative steps (..., n):
+    # after the first clamp the walk can only run into the far zone edge.
+    is_long, market, zone_lower, zone_upper = (np.asarray(a)[..., None] for a in (is_long, market, zone_lower, zone_upper))
+    first = clamp_v(market + np.where(is_long, -steps[..., :1], steps[..., :1]), zone_lower, zone_upper)
+    extra = np.cumsum(steps, axis=-1) - steps[..., :1]
+    return np.where(is_long, np.maximum(zone_lower, first - extra), np.minimum(zone_upper, first + extra))
+
+# ---------- Batch Engine ----------
+def batch_ladders(side, market, zone_upper, zone_lower, atr, adx=0.0, macd="Neutral", sl_buf=1.0,
+                  params: LadderParams = DEFAULT_PARAMS, rsi_trigger="None"):
+    # Scalars broadcast against the array inputs; rows the page would reject come back as NaN.
+    side, macd, rsi_trigger = np.asarray(side), np.asarray(macd), np.asarray(rsi_trigger)
+    numeric = [np.asarray(a, dtype=np.float64) for a in (market, zone_upper, zone_lower, atr, adx, sl_buf)]
+    shape = np.broadcast_shapes(side.shape, macd.shape, rsi_trigger.shape, *(a.shape for a in numeric))
+    market, zone_upper, zone_lower, atr, adx, sl_buf = (np.broadcast_to(a, shape) for a in numeric)
+    is_long = np.broadcast_to(side == "Long", shape)
+    macd, rsi_trigger = np.broadcast_to(macd, shape), np.broadcast_to(rsi_trigger, shape)
+
+    valid = (market > 0) & (atr > 0) & (zone_upper > 0) & (zone_lower > 0) & (zone_lower < zone_upper)
+    zone_w = zone_upper - zone_lower
+    ladders, k = ladder_count_v(zone_w, atr, adx, params.k_split, params.adx_trend)
+    ladders = rsi_gated_count_v(ladders, rsi_trigger, is_long)
+    base_step = params.base_step_mult * atr
+    step = macd_nudged_step_v(is_long, base_step, macd, atr, params.nudge_mult)
+
+    walked = walk_levels(is_long, market, zone_lower, zone_upper, np.stack([step, step], axis=-1))
+    l1 = walked[..., 0]
+    l2 = np.where(ladders == 3, walked[..., 1], np.nan)
+    # Sort ladders descending (highest to lowest price), missing L2 stays last
+    levels = -np.sort(-np.stack([market, l1, l2], axis=-1), axis=-1)
+
+    sl = np.where(is_long, zone_lower - sl_buf*atr, zone_upper + sl_buf*atr)
+    tp = np.where(is_long, market + params.tp_mult*atr, market - params.tp_mult*atr)
+    rr = np.where(is_long,
+                  (tp - market) / np.maximum(market - sl, 1e-12),
+                  (market - tp) / np.maximum(sl - market, 1e-12))
+
+    out = np.empty(shape, dtype=LADDER_DTYPE)
+    out["L0"], out["L1"], out["L2"] = levels[..., 0], levels[..., 1], levels[..., 2]
+    out["sl"], out["tp"], out["rr"], out["k"] = sl, tp, rr, k
+    out["base_step"], out["step"] = base_step, step
+    for name in ("L0", "L1", "L2", "sl", "tp", "rr", "k", "base_step", "step"):
+        out[name][~valid] = np.nan
+    out["ladders"] = np.where(valid, ladders, 0)
+    out["valid"] = valid
+    return out
+
+# ---------- N-Level Grid ----------
+SPACINGS = ("linear", "atr", "geometric")
+
+def ladder_grid(side, market, zone_upper, zone_lower, atr, n_levels: int = 10, spacing: str = "atr",
+                step_mult: float = BASE_STEP_MULT, ratio: float = 1.5):
+    # (instruments × n_levels) grid in depth order: column 0 is market, then each level one
+    # step further into the zone, clamped to it the same way as L1/L2.
+    #   linear    — zone width split into n_levels - 1 equal steps
+    #   atr       — constant step of step_mult × ATR
+    #   geometric — first step step_mult × ATR, each next step × ratio
+    if spacing not in SPACINGS:
+        raise ValueError(f"spacing must be one of {', '.join(SPACINGS)}")
+    if n_levels < 2:
+        raise ValueError("n_levels must be at least 2")
+    # walk_levels' closed form needs non-negative steps
+    if spacing != "linear" and step_mult <= 0:
+        raise ValueError("step_mult must be positive")
+    if spacing == "geometric" and ratio <= 0:
+        raise ValueError("ratio must be positive")
+    side = np.asarray(side)
+    market, zone_upper, zone_lower, atr, is_long = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (market, zone_upper, zone_lower, atr)), side == "Long")
+    i = np.arange(n_levels - 1, dtype=np.float64)
+    if spacing == "linear":
+        unit = (zone_upper - zone_lower) / (n_levels - 1)
+        mult = np.ones_like(i)
+    else:
+        unit = step_mult * atr
+        mult = np.ones_like(i) if spacing == "atr" else ratio ** i
+    steps = unit[..., None] * mult
+    grid = np.concatenate([market[..., None], walk_levels(is_long, market, zone_lower, zone_upper, steps)], axis=-1)
+    valid = (market > 0) & (atr > 0) & (zone_lower > 0) & (zone_lower < zone_upper)
+    return np.where(valid[..., None], grid, np.nan)
+
+def results_to_array(results) -> np.ndarray:
+    # Pack LadderResult objects (e.g. a backtest history) into one LADDER_DTYPE array
+    out = np.zeros(len(results), dtype=LADDER_DTYPE)
+    for i, r in enumerate(results):
+        lv = r.levels + (np.nan,) * (3 - len(r.levels))
+        out[i] = (*lv, r.sl, r.tp, r.rr, r.k, r.ladders, r.base_step, r.step, True)
+    return out
+
+# ---------- Table Columns ----------
+REQUIRED = ["symbol", "side", "market", "zone_upper", "zone_lower", "atr"]
+OPTIONAL = {"adx": 0.0, "macd": "Neutral", "rsi_trigger": "None"}
+ALIASES = {"uz": "zone_upper", "lz": "zone_lower", "rsi-3 trigger": "rsi_trigger", "rsi3": "rsi_trigger"}
+OUT_COLS = ["L0", "L1", "L2", "sl", "tp", "rr", "k", "ladders", "step"]
+
+# ---------- DataFrame Front-end ----------
+def normalize_columns(df):
+    df = df.rename(columns=lambda c: ALIASES.get(c.strip().lower(), c.strip().lower()))
+    missing = [c for c in REQUIRED if c not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    for col, default in OPTIONAL.items():
+        if col not in df.columns:
+            df[col] = default
+    return df
+
+def batch_frame(df, sl_buf: float = 1.0):
+    # Works on any pandas DataFrame without importing pandas here
+    df = normalize_columns(df)
+    res = batch_ladders(
+        df["side"].to_numpy(dtype=str), df["market"].to_numpy(np.float64),
+        df["zone_upper"].to_numpy(np.float64), df["zone_lower"].to_numpy(np.float64),
+        df["atr"].to_numpy(np.float64), df["adx"].fillna(0.0).to_numpy(np.float64),
+        df["macd"].fillna("Neutral").to_numpy(dtype=str), sl_buf,
+        rsi_trigger=df["rsi_trigger"].fillna("None").to_numpy(dtype=str),
+    )
+    out = df[["symbol", "side"]].reset_index(drop=True)
+    for col in OUT_COLS:
+        out[col] = res[col]
+    out["valid"] = res["valid"]
+    return out
+
+def grid_frame(df, n_levels: int, spacing: str = "atr", step_mult: float = BASE_STEP_MULT, ratio: float = 1.5):
+    # N-level counterpart of batch_frame: symbol, side, L0..L{n-1} in depth order
+    df = normalize_columns(df)
+    grid = ladder_grid(df["side"].to_numpy(dtype=str), df["market"].to_numpy(np.float64),
+                       df["zone_upper"].to_numpy(np.float64), df["zone_lower"].to_numpy(np.float64),
+                       df["atr"].to_numpy(np.float64), n_levels, spacing, step_mult, ratio)
+    out = df[["symbol", "side"]].reset_index(drop=True)
+    for j in range(n_levels):
+        out[f"L{j}"] = grid[:, j]
+    out["valid"] = ~np.isnan(grid[:, 0])
+    return out
@@ -0,0 +1,66 @@
+# ladder_cache.py — Bounded LRU + TTL memoization of compute_ladder for the library path
+
+import threading
+import time
+from collections import OrderedDict
+
+from ladder_core import compute_ladder
+
+# ---------- LRU Cache ----------
+class LRUCache:
+    def __init__(self, maxsize: int = 4096, ttl: float | None = 300.0):
+        self.maxsize, self.ttl = maxsize, ttl
+        self.hits = self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, stamp = item
+            if self.ttl is not None and time.monotonic() - stamp > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self): return len(self._data)
+
+_cache = LRUCache()
+
+# ---------- Cached Compute ----------
+def ladder_key(side, market, zone_upper, zone_lower, atr, adx=0.0, macd="Neutral", sl_buf=1.0, rsi_trigger="None"):
+    return (str(side), float(market), float(zone_upper), float(zone_lower),
+            float(atr), float(adx), str(macd), float(sl_buf), str(rsi_trigger))
+
+def cached_compute_ladder(*args, **kwargs):
+    key = ladder_key(*args, **kwargs)
+    res = _cache.get(key)
+    if res is None:
+        res = compute_ladder(*key)
+        _cache.put(key, res)
+    return res
+
+def configure_cache(maxsize: int = 4096, ttl: float | None = 300.0):
+    global _cache
+    _cache = LRUCache(maxsize, ttl)
+
+def cache_info():
+    return {"hits": _cache.hits, "misses": _cache.misses, "size": len(_cache), "maxsize": _cache.maxsize, "ttl": _cache.ttl}
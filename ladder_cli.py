@@ -0,0 +1,86 @@
+# ladder_cli.py — Stream a CSV/Parquet file of instruments through the batch ladder engine
+#
+#   python ladder_cli.py snapshot.csv ladders.csv --sl-buf 1.5 --chunksize 200000
+
+import argparse
+import sys
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from ladder_batch import SPACINGS, batch_frame, grid_frame, normalize_columns
+from instruments import InstrumentIndex, snap_frame
+from ladder_core import BASE_STEP_MULT
+
+# ---------- Chunked IO ----------
+def read_chunks(path: str, chunksize: int):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+class ChunkWriter:
+    def __init__(self, path: str):
+        self.path, self._pq, self._first = path, None, True
+
+    def write(self, df: pd.DataFrame):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._pq is None:
+                self._pq = pq.ParquetWriter(self.path, table.schema)
+            self._pq.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._pq is not None:
+            self._pq.close()
+
+# ---------- Pipeline ----------
+def run(src: str, dst: str, sl_buf: float = 1.0, chunksize: int = 100_000, frame=None) -> int:
+    # frame: chunk -> output DataFrame; defaults to the L0..L2 / SL / TP ladder
+    frame = frame or partial(batch_frame, sl_buf=sl_buf)
+    writer, rows = ChunkWriter(dst), 0
+    try:
+        for chunk in read_chunks(src, chunksize):
+            writer.write(frame(chunk))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compute ladders, SL, TP and RR for every row of a CSV/Parquet file.")
+    ap.add_argument("input", help="CSV or .parquet file with symbol, side, market, zone_upper, zone_lower, atr [, adx, macd, rsi_trigger]")
+    ap.add_argument("output", help="CSV or .parquet file to write")
+    ap.add_argument("--sl-buf", type=float, default=1.0, choices=[1.0, 1.5], help="SL buffer × ATR (default 1.0)")
+    ap.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk (default 100000)")
+    ap.add_argument("--levels", type=int, default=None, help="write an N-level grid (L0..L{N-1}) instead of the 2-3 level ladder")
+    ap.add_argument("--spacing", choices=SPACINGS, default="atr", help="grid spacing for --levels (default atr)")
+    ap.add_argument("--step-mult", type=float, default=BASE_STEP_MULT, help="grid step as a multiple of ATR (atr/geometric)")
+    ap.add_argument("--ratio", type=float, default=1.5, help="step growth per level for geometric spacing")
+    ap.add_argument("--instruments", default=None, help="CSV of symbol, tick_size [, lot_size, min_notional]; snaps prices to each tick")
+    args = ap.parse_args(argv)
+    frame = None
+    if args.levels:
+        frame = partial(grid_frame, n_levels=args.levels, spacing=args.spacing, step_mult=args.step_mult, ratio=args.ratio)
+    if args.instruments:
+        # Metadata is indexed once up front; every chunk then snaps with one vectorized lookup
+        index, base = InstrumentIndex.from_csv(args.instruments), frame or partial(batch_frame, sl_buf=args.sl_buf)
+        frame = lambda chunk: snap_frame(base(chunk), index, normalize_columns(chunk)["market"].to_numpy(np.float64))
+    try:
+        rows = run(args.input, args.output, args.sl_buf, args.chunksize, frame)
+    except (KeyError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {rows} ladders to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# ladder_core.py — Ladder rules shared by the Streamlit page and the batch tools
+# Import-safe: no Streamlit at module load, so workers can reuse compute_ladder directly.
+
+from dataclasses import dataclass
+
+# ---------- Constants ----------
+DEC = 4
+BASE_STEP_MULT = 0.5
+NUDGE_MULT = 0.25
+TP_MULT = 2.0
+K_SPLIT = 1.2      # zone width / ATR at which a third ladder is added
+ADX_TREND = 25.0   # ADX at or above this drops one ladder
+RSI_MOMENTUM = "Crossed 50↑"  # RSI-3 trigger that drops the deep L2 on Long ladders
+
+# ---------- Tunable Parameters ----------
+# The constants above as one hashable record, so batch/backtest/sweep code can vary them.
+@dataclass(slots=True, frozen=True)
+class LadderParams:
+    base_step_mult: float = BASE_STEP_MULT
+    nudge_mult: float = NUDGE_MULT
+    tp_mult: float = TP_MULT
+    k_split: float = K_SPLIT
+    adx_trend: float = ADX_TREND
+
+DEFAULT_PARAMS = LadderParams()
+
+# ---------- Helper Functions ----------
+def ladder_count(zone_w: float, atr_val: float, adx_val: float):
+    if atr_val <= 0:
+        return 2, 0.0
+    k = zone_w / atr_val
+    base = 2 if k < K_SPLIT else 3
+    if adx_val >= ADX_TREND:
+        base = max(2, base - 1)
+    return base, k
+
+def macd_nudged_step(side: str, base_step: float, macd_state: str, atr_val: float) -> float:
+    if macd_state == "Neutral": return base_step
+    if side == "Long":
+        return max(0.0, base_step - NUDGE_MULT*atr_val) if macd_state == "Bullish" else (base_step + NUDGE_MULT*atr_val)
+    else:
+        return max(0.0, base_step - NUDGE_MULT*atr_val) if macd_state == "Bearish" else (base_step + NUDGE_MULT*atr_val)
+
+def rsi_gated_count(ladders: int, rsi_trigger: str, side: str = "Long") -> int:
+    # Only a 50↑ (momentum) cross changes the count: it caps a Long ladder at two levels.
+    # 20↑ (oversold) and "None" (no trigger given) leave it as ADX/k decided. Both triggers
+    # are upward crossings, i.e. long-side signals, so Short ladders ignore them.
+    return min(ladders, 2) if side == "Long" and rsi_trigger == RSI_MOMENTUM else ladders
+
+def clamp(x, lo, hi): return max(lo, min(hi, x))
+
+def deltas_from_market(px: float, mkt: float, side: str):
+    d = abs(px - mkt)
+    pct = (d / mkt * 100) if mkt > 0 else 0.0
+    where = ("below" if px < mkt else "above") if side == "Long" else ("above" if px > mkt else "below")
+    return d, pct, where
+
+# ---------- Result ----------
+# Slotted so millions of historical ladders don't each carry a __dict__; frozen so cached results can be shared.
+@dataclass(slots=True, frozen=True)
+class LadderResult:
+    side: str
+    market: float
+    levels: tuple
+    sl: float
+    tp: float
+    rr: float
+    k: float
+    ladders: int
+    zone_w: float
+    base_step: float
+    step: float
+
+# ---------- Compute ----------
+def validate_inputs(market: float, zone_upper: float, zone_lower: float, atr: float):
+    if market <= 0 or atr <= 0 or zone_upper <= 0 or zone_lower <= 0:
+        raise ValueError("Please enter positive numbers for **Market**, **ATR**, **Upper Zone**, and **Lower Zone**.")
+    if zone_lower >= zone_upper:
+        raise ValueError("**Lower Zone** must be less than **Upper Zone**.")
+
+def compute_ladder(side: str, market: float, zone_upper: float, zone_lower: float, atr: float,
+                   adx: float = 0.0, macd: str = "Neutral", sl_buf: float = 1.0,
+                   rsi_trigger: str = "None") -> LadderResult:
+    validate_inputs(market, zone_upper, zone_lower, atr)
+    zone_w = zone_upper - zone_lower
+    ladders, k = ladder_count(zone_w, atr, adx)
+    ladders = rsi_gated_count(ladders, rsi_trigger, side)
+    base_step = BASE_STEP_MULT * atr
+    step = macd_nudged_step(side, base_step, macd, atr)
+    # Ladder levels
+    L = [market]
+    if side == "Long":
+        L1 = clamp(market - step, zone_lower, zone_upper); L.append(L1)
+        if ladders == 3:
+            L2 = clamp(L1 - step, zone_lower, zone_upper); L.append(L2)
+    else:
+        L1 = clamp(market + step, zone_lower, zone_upper); L.append(L1)
+        if ladders == 3:
+            L2 = clamp(L1 + step, zone_lower, zone_upper); L.append(L2)
+    # Sort ladders descending for consistent display (highest to lowest price)
+    L.sort(reverse=True)
+    # Stop loss and TP
+    if side == "Long":
+        sl = zone_lower - sl_buf*atr
+        tp = market + TP_MULT*atr
+    else:
+        sl = zone_upper + sl_buf*atr
+        tp = market - TP_MULT*atr
+    rr = ((tp - market) / max(market - sl, 1e-12)) if side == "Long" else ((market - tp) / max(sl - market, 1e-12))
+    return LadderResult(side, market, tuple(L), sl, tp, rr, k, ladders, zone_w, base_step, step)
@@ -0,0 +1,120 @@
+# ladder_history.py — Append-only SQLite audit trail of computed ladders
+#
+# record()/record_frame() only enqueue; a background thread owns the write connection and
+# commits whatever has queued up in one transaction, so callers never wait on disk.
+
+import atexit
+import math
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+
+import pandas as pd
+
+COLUMNS = ("ts", "user", "symbol", "side", "market", "zone_upper", "zone_lower", "atr", "adx", "macd",
+           "sl_buf", "rsi_trigger", "L0", "L1", "L2", "sl", "tp", "rr", "k", "ladders", "step")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ladders (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL, user TEXT, symbol TEXT, side TEXT,
+    market REAL, zone_upper REAL, zone_lower REAL, atr REAL, adx REAL, macd TEXT,
+    sl_buf REAL, rsi_trigger TEXT,
+    L0 REAL, L1 REAL, L2 REAL, sl REAL, tp REAL, rr REAL, k REAL, ladders INTEGER, step REAL
+);
+CREATE INDEX IF NOT EXISTS ladders_symbol_ts ON ladders(symbol, ts);
+CREATE INDEX IF NOT EXISTS ladders_ts ON ladders(ts);
+"""
+
+def _num(v):
+    # NaN (missing L2, rejected rows) is stored as NULL
+    return None if v is None or (isinstance(v, float) and math.isnan(v)) else v
+
+# ---------- Store ----------
+class HistoryStore:
+    def __init__(self, path: str = "ladder_history.db", batch_size: int = 1000):
+        self.path, self.batch_size = path, batch_size
+        with closing(self._connect()) as con:
+            con.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer thread
+            con.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="ladder-history", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+
+    # ---------- Writes ----------
+    def record(self, res, zone_upper, zone_lower, atr, adx=0.0, macd="Neutral", sl_buf=1.0,
+               rsi_trigger="None", symbol: str = "", user: str = ""):
+        # res: LadderResult from compute_ladder
+        lv = tuple(res.levels) + (None,) * (3 - len(res.levels))
+        self._queue.put([(time.time(), user, symbol, res.side, res.market, zone_upper, zone_lower, atr, adx, macd,
+                          sl_buf, rsi_trigger, *lv, res.sl, res.tp, res.rr, res.k, res.ladders, res.step)])
+
+    def record_frame(self, inputs: pd.DataFrame, out: pd.DataFrame, sl_buf=1.0, user: str = ""):
+        # inputs: normalized batch input table, out: matching batch_frame result rows
+        now = time.time()
+        cols = [inputs[c].tolist() for c in ("symbol", "side", "market", "zone_upper", "zone_lower", "atr", "adx", "macd")]
+        cols += [[sl_buf] * len(out), inputs["rsi_trigger"].tolist()]
+        cols += [out[c].tolist() for c in ("L0", "L1", "L2", "sl", "tp", "rr", "k", "ladders", "step")]
+        self._queue.put([(now, user, *row) for row in zip(*cols)])
+
+    def _writer(self):
+        con = self._connect()
+        sql = f"INSERT INTO ladders ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        while True:
+            batches = [self._queue.get()]
+            while len(batches) < self.batch_size:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batches
+            rows = [tuple(map(_num, r)) for b in batches if b is not None for r in b]
+            try:
+                if rows:
+                    with con:
+                        con.executemany(sql, rows)
+            except sqlite3.Error as e:
+                # Keep the writer alive; a locked or full disk loses this batch, not the trail
+                print(f"ladder history: dropped {len(rows)} rows ({e})", file=sys.stderr)
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+            if stop:
+                con.close()
+                return
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # ---------- Queries ----------
+    def query(self, symbol: str | None = None, since: float | None = None, until: float | None = None,
+              user: str | None = None, limit: int = 1000) -> pd.DataFrame:
+        # Newest first; symbol + time range is served by the (symbol, ts) index
+        where, args = [], []
+        for clause, val in (("symbol = ?", symbol), ("ts >= ?", since), ("ts < ?", until), ("user = ?", user)):
+            if val is not None:
+                where.append(clause)
+                args.append(val)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM ladders"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query(sql, con, params=(*args, limit))
+        df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+        return df
+
+    def recent(self, symbol: str | None = None, days: float = 7.0, limit: int = 1000) -> pd.DataFrame:
+        return self.query(symbol, since=time.time() - days * 86400, limit=limit)
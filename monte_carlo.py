@@ -0,0 +1,70 @@
+# monte_carlo.py — ATR-scaled Monte Carlo outcomes for a computed ladder
+#
+# Paths are driftless Gaussian walks with `substeps` points per bar and a per-bar
+# standard deviation of `vol_per_atr` × ATR. Fill/exit rules match backtest.simulate:
+# levels at or through market fill at once, resting levels fill when touched, and the
+# first of SL/TP closes the trade (equal size per filled level).
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+CHUNK = 20_000  # paths per chunk; each chunk has its own seed, so results don't depend on `processes`
+
+def _simulate_chunk(args):
+    seed, n, market, levels, sl, tp, is_long, step_sd, steps = args
+    rng = np.random.default_rng(seed)
+    paths = market + np.cumsum(rng.standard_normal((n, steps), dtype=np.float32) * np.float32(step_sd), axis=1)
+    never = steps
+    first = lambda hit: np.where(hit.any(1), hit.argmax(1), never)
+    sl_i = first(paths <= sl if is_long else paths >= sl)
+    tp_i = first(paths >= tp if is_long else paths <= tp)
+    exit_i = np.minimum(sl_i, tp_i)
+    tp_first = tp_i < sl_i
+    sl_first = sl_i < tp_i
+    exit_px = np.where(sl_first, sl, np.where(tp_first, tp, paths[:, -1]))
+
+    filled = np.zeros((n, len(levels)), dtype=bool)
+    for j, lv in enumerate(levels):
+        if (lv >= market) if is_long else (lv <= market):
+            filled[:, j] = True
+        else:
+            # A never-touched level must not count as filled on paths that never exit either
+            hit = paths <= lv if is_long else paths >= lv
+            filled[:, j] = hit.any(1) & (hit.argmax(1) <= exit_i)
+    sign = 1.0 if is_long else -1.0
+    lv = np.asarray(levels)
+    pnl = sign * (exit_px * filled.sum(1) - (filled * lv).sum(1))
+    risk = (filled * np.abs(lv - sl)).sum(1)
+    r = np.where(risk > 0, pnl / np.where(risk > 0, risk, 1.0), 0.0)
+    return n, filled.sum(0), int(tp_first.sum()), int(sl_first.sum()), float(r.sum()), float((r * r).sum())
+
+def simulate_ladder(res, atr: float, n_paths: int = 100_000, horizon: int = 20, substeps: int = 6,
+                    vol_per_atr: float = 0.8, seed: int = 0, processes: int = 1) -> dict:
+    # res: LadderResult. Returns fill probability per level, P(TP before SL), P(SL first),
+    # P(neither within horizon) and expected R with its standard error.
+    is_long = res.side == "Long"
+    steps = horizon * substeps
+    step_sd = vol_per_atr * atr / np.sqrt(substeps)
+    sizes = [CHUNK] * (n_paths // CHUNK) + ([n_paths % CHUNK] if n_paths % CHUNK else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, n, res.market, tuple(res.levels), res.sl, res.tp, is_long, step_sd, steps) for s, n in zip(seeds, sizes)]
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(min(processes, len(jobs))) as pool:
+            parts = list(pool.map(_simulate_chunk, jobs))
+    else:
+        parts = [_simulate_chunk(j) for j in jobs]
+    n = sum(p[0] for p in parts)
+    fills = sum(p[1] for p in parts)
+    tp_n, sl_n = sum(p[2] for p in parts), sum(p[3] for p in parts)
+    r_sum, r_sq = sum(p[4] for p in parts), sum(p[5] for p in parts)
+    mean_r = r_sum / n
+    return {
+        "paths": n,
+        "fill_prob": (fills / n).tolist(),
+        "p_tp_first": tp_n / n,
+        "p_sl_first": sl_n / n,
+        "p_open": 1 - (tp_n + sl_n) / n,
+        "expected_r": mean_r,
+        "expected_r_se": float(np.sqrt(max(r_sq / n - mean_r ** 2, 0.0) / n)),
+    }
@@ -0,0 +1,107 @@
+# ohlcv_store.py — Memory-mapped columnar OHLCV store (one raw array file per column)
+#
+#   <root>/index.json                      {"BTCUSDT/1h": {"rows": ..., "start": ..., "end": ...}, ...}
+#   <root>/<symbol>/<timeframe>/ts.i8      int64 UTC nanoseconds, strictly increasing
+#   <root>/<symbol>/<timeframe>/<col>.f8   float64 open/high/low/close/volume
+#
+# Range reads binary-search the mmapped timestamps and return views, so slicing a
+# date range touches only the pages it needs and never re-parses CSV.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+class OHLCVStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, "index.json")
+        self._maps = {}
+        try:
+            with open(self._index_path) as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+
+    # ---------- Paths / Index ----------
+    def _dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, symbol, timeframe)
+
+    def _save_index(self):
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    def series(self) -> list[tuple[str, str]]:
+        return [tuple(k.split("/", 1)) for k in sorted(self.index)]
+
+    # ---------- Writes ----------
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame, append: bool = False):
+        # df: DatetimeIndex + COLUMNS. append=True adds rows strictly after the stored end.
+        key, path = f"{symbol}/{timeframe}", self._dir(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+        ts = pd.DatetimeIndex(df.index)
+        ts = (ts.tz_convert("UTC") if ts.tz is not None else ts.tz_localize("UTC")).asi8
+        if len(ts) > 1 and np.any(np.diff(ts) <= 0):
+            raise ValueError("OHLCV index must be strictly increasing.")
+        prev = self.index.get(key) if append else None
+        if prev and len(ts) and ts[0] <= prev["end"]:
+            raise ValueError(f"Appended rows must start after {pd.Timestamp(prev['end'], tz='UTC')}.")
+        mode = "ab" if prev else "wb"
+        self._maps.pop(key, None)
+        with open(os.path.join(path, "ts.i8"), mode) as f:
+            f.write(np.ascontiguousarray(ts, dtype="<i8").tobytes())
+        for col in COLUMNS:
+            with open(os.path.join(path, f"{col}.f8"), mode) as f:
+                f.write(np.ascontiguousarray(df[col].to_numpy(), dtype="<f8").tobytes())
+        rows = (prev["rows"] if prev else 0) + len(ts)
+        start = prev["start"] if prev else (int(ts[0]) if len(ts) else None)
+        end = int(ts[-1]) if len(ts) else (prev["end"] if prev else None)
+        self.index[key] = {"rows": rows, "start": start, "end": end}
+        self._save_index()
+
+    def import_csv(self, path: str, symbol: str, timeframe: str):
+        from indicators import load_ohlcv
+        self.write(symbol, timeframe, load_ohlcv(path))
+
+    # ---------- Reads ----------
+    def _columns(self, symbol: str, timeframe: str) -> dict:
+        key = f"{symbol}/{timeframe}"
+        maps = self._maps.get(key)
+        if maps is None:
+            meta = self.index.get(key)
+            if meta is None:
+                raise KeyError(f"No OHLCV stored for {key}")
+            path, rows = self._dir(symbol, timeframe), meta["rows"]
+            open_map = lambda name, dt: (np.memmap(os.path.join(path, name), dtype=dt, mode="r", shape=(rows,))
+                                         if rows else np.empty(0, dtype=dt))
+            maps = {"ts": open_map("ts.i8", "<i8"), **{c: open_map(f"{c}.f8", "<f8") for c in COLUMNS}}
+            self._maps[key] = maps
+        return maps
+
+    def slice(self, symbol: str, timeframe: str, start=None, end=None) -> dict:
+        # Zero-copy views over [start, end); bounds are anything pd.Timestamp accepts
+        cols = self._columns(symbol, timeframe)
+        ts = cols["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, _ns(start), "left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, _ns(end), "left"))
+        return {name: arr[lo:hi] for name, arr in cols.items()}
+
+    def frame(self, symbol: str, timeframe: str, start=None, end=None) -> pd.DataFrame:
+        # pandas-shaped view for indicators/backtests (pandas may copy into its own blocks)
+        cols = self.slice(symbol, timeframe, start, end)
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(cols.pop("ts")), utc=True), name="timestamp")
+        return pd.DataFrame({c: np.asarray(cols[c]) for c in COLUMNS}, index=index)
+
+    def lower_tf(self, symbol: str, timeframe: str):
+        # lower_tf loader for run_backtest/resolve_intrabar: each ambiguous bar reads one mmapped window
+        return lambda start, end: self.slice(symbol, timeframe, start, end)
+
+def _ns(t) -> int:
+    t = pd.Timestamp(t)
+    return (t.tz_convert("UTC") if t.tzinfo is not None else t.tz_localize("UTC")).value
@@ -0,0 +1,119 @@
+# price_feed.py — Async price feeds that keep ladders current, coalescing tick bursts
+#
+#   tracker = LadderTracker(interval=0.25)
+#   tracker.watch("BTCUSDT", "Long", zone_upper=..., zone_lower=..., atr=..., adx=..., macd="Bullish")
+#   await tracker.run(FileReplayFeed("ticks.csv", speed=60), on_update)
+
+import asyncio
+import csv
+import time
+
+import numpy as np
+
+from ladder_batch import batch_ladders
+
+# ---------- Feeds ----------
+# A feed is any async iterable of (symbol, price) ticks.
+class FileReplayFeed:
+    # Replays a CSV of timestamp,symbol,price. speed=None replays as fast as possible,
+    # otherwise inter-tick gaps are divided by `speed` (1 = real time).
+    def __init__(self, path: str, speed: float | None = None):
+        self.path, self.speed = path, speed
+
+    async def __aiter__(self):
+        first = started = None
+        with open(self.path, newline="") as f:
+            for row in csv.DictReader(f):
+                if self.speed:
+                    ts = float(row["timestamp"])
+                    if first is None:
+                        first, started = ts, time.monotonic()
+                    # Sleep only when ahead of the replay clock, so dense bursts stay dense
+                    ahead = (ts - first) / self.speed - (time.monotonic() - started)
+                    await asyncio.sleep(ahead if ahead > 0.001 else 0)
+                else:
+                    await asyncio.sleep(0)  # let the flusher run during bursts
+                yield row["symbol"], float(row["price"])
+
+class SocketFeed:
+    # Newline-delimited "symbol,price" over TCP (e.g. `nc -l 9000 < ticks.txt` for testing)
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+
+    async def __aiter__(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while line := await reader.readline():
+                symbol, price = line.decode().strip().split(",")[:2]
+                yield symbol, float(price)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+# ---------- Tracker ----------
+class LadderTracker:
+    # Keeps the latest price per watched symbol and re-ladders changed symbols at most
+    # once per `interval` seconds, all of them in one batch_ladders call.
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.config = {}
+        self.latest = {}
+        self._dirty = set()
+        self.ticks = self.recomputes = 0
+
+    def watch(self, symbol: str, side: str, zone_upper: float, zone_lower: float, atr: float,
+              adx: float = 0.0, macd: str = "Neutral", sl_buf: float = 1.0, rsi_trigger: str = "None"):
+        self.config[symbol] = (side, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger)
+        if symbol in self.latest:
+            self._dirty.add(symbol)
+
+    def on_tick(self, symbol: str, price: float):
+        self.ticks += 1
+        if symbol in self.config:
+            self.latest[symbol] = price
+            self._dirty.add(symbol)
+
+    def flush(self):
+        # Recompute every symbol that ticked since the last flush; returns (symbols, LADDER_DTYPE rows)
+        if not self._dirty:
+            return [], None
+        symbols, self._dirty = sorted(self._dirty), set()
+        cfg = [self.config[s] for s in symbols]
+        side, zu, zl, atr, adx, macd, sl_buf, rsi = (np.array(c) for c in zip(*cfg))
+        market = np.array([self.latest[s] for s in symbols])
+        self.recomputes += 1
+        return symbols, batch_ladders(side, market, zu, zl, atr, adx, macd, sl_buf, rsi_trigger=rsi)
+
+    async def run(self, feed, on_update):
+        # on_update(symbols, ladders) is called from the flush loop, never per tick
+        done = asyncio.Event()
+
+        async def consume():
+            try:
+                async for symbol, price in feed:
+                    self.on_tick(symbol, price)
+            finally:
+                done.set()
+
+        async def flusher():
+            while not done.is_set():
+                started = time.monotonic()
+                symbols, ladders = self.flush()
+                if symbols:
+                    on_update(symbols, ladders)
+                try:
+                    await asyncio.wait_for(done.wait(), max(0.0, self.interval - (time.monotonic() - started)))
+                except asyncio.TimeoutError:
+                    pass
+            symbols, ladders = self.flush()
+            if symbols:
+                on_update(symbols, ladders)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            await flusher()
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+            if consumer.done() and not consumer.cancelled() and consumer.exception():
+                raise consumer.exception()
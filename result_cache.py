@@ -0,0 +1,98 @@
+# result_cache.py — Content-addressed on-disk cache for backtest and sweep results
+#
+# Keys hash (data fingerprint, ladder parameters, code version), so a changed input,
+# parameter or rule file simply misses. Entries are evicted by age and total size.
+
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+CODE_FILES = ("ladder_core.py", "ladder_batch.py", "backtest.py", "sim_kernel.py", "indicators.py", "sweep.py")
+
+# ---------- Fingerprints ----------
+def data_fingerprint(*arrays) -> str:
+    h = hashlib.sha256()
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        h.update(a.view(np.uint8) if a.dtype.kind != "U" else a.tobytes())
+    return h.hexdigest()
+
+def code_version(files=CODE_FILES) -> str:
+    here, h = os.path.dirname(os.path.abspath(__file__)), hashlib.sha256()
+    for name in files:
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+def cache_key(data_fp: str, params: dict, version: str) -> str:
+    blob = json.dumps({"data": data_fp, "params": params, "code": version}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+# ---------- Disk Cache ----------
+class DiskCache:
+    def __init__(self, root: str, max_bytes: int = 2 * 2**30, max_age: float | None = 30 * 86400):
+        self.root, self.max_bytes, self.max_age = root, max_bytes, max_age
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".pkl")
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return default
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # recency for size-based eviction
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            # Includes entries another sweep sharing this cache dir evicted mid-read
+            return default
+        return value
+
+    def put(self, key: str, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def get_or_compute(self, key: str, fn):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def evict(self) -> int:
+        # Drop expired entries, then least recently used until under max_bytes
+        entries, now = [], time.time()
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".pkl"):
+                    p = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(p)
+                    except FileNotFoundError:  # evicted by another process since the walk
+                        continue
+                    entries.append((st.st_mtime, st.st_size, p))
+        removed, total = 0, sum(e[1] for e in entries)
+        for mtime, size, p in sorted(entries):
+            if total <= self.max_bytes and (self.max_age is None or now - mtime <= self.max_age):
+                continue
+            try:
+                os.remove(p)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+_MISSING = object()
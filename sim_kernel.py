@@ -0,0 +1,55 @@
+# sim_kernel.py — Bar-by-bar ladder fill/exit kernel, JIT-compiled with Numba when available
+#
+# Same semantics as backtest.simulate: the level at or through market fills on the signal
+# bar, resting levels fill when touched, SL/TP are watched from the next bar and a bar
+# touching both counts as SL. Without Numba the identical loop runs as plain Python.
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# ---------- Reference Loop ----------
+def simulate_loop_py(high, low, close, sig_pos, is_long, levels, sl, tp, horizon):
+    n, S, m = close.shape[0], sig_pos.shape[0], levels.shape[1]
+    fill_bar = np.full((S, m), -1, dtype=np.int64)
+    exit_bar = np.empty(S, dtype=np.int64)
+    exit_price = np.empty(S, dtype=np.float64)
+    reason = np.empty(S, dtype=np.int64)
+    for i in range(S):
+        s, lg = sig_pos[i], is_long[i]
+        mkt = close[s]
+        for j in range(m):
+            lv = levels[i, j]
+            if lv == lv and ((lg and lv >= mkt) or (not lg and lv <= mkt)):
+                fill_bar[i, j] = s
+        last = min(s + horizon, n - 1)
+        exit_bar[i], exit_price[i], reason[i] = last, close[last], 3
+        for b in range(s + 1, last + 1):
+            for j in range(m):
+                lv = levels[i, j]
+                if fill_bar[i, j] < 0 and lv == lv and ((lg and low[b] <= lv) or (not lg and high[b] >= lv)):
+                    fill_bar[i, j] = b
+            if (lg and low[b] <= sl[i]) or (not lg and high[b] >= sl[i]):
+                exit_bar[i], exit_price[i], reason[i] = b, sl[i], 1
+                break
+            if (lg and high[b] >= tp[i]) or (not lg and low[b] <= tp[i]):
+                exit_bar[i], exit_price[i], reason[i] = b, tp[i], 2
+                break
+    return fill_bar, exit_bar, exit_price, reason
+
+# Compiled once per machine and cached next to this file (__pycache__)
+simulate_loop = numba.njit(cache=True, nogil=True)(simulate_loop_py) if NUMBA_AVAILABLE else simulate_loop_py
+
+# ---------- Warm-up ----------
+def warm_up():
+    # Trigger (or load the cached) compilation for the dtypes the backtester passes,
+    # so the first real request doesn't pay JIT latency.
+    px = np.array([1.0, 1.1, 0.9, 1.2])
+    simulate_loop(px, px, px, np.array([0], dtype=np.int64), np.array([True]),
+                  np.array([[1.0, 0.95, np.nan]]), np.array([0.8]), np.array([1.3]), 3)
+    return NUMBA_AVAILABLE
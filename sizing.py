@@ -0,0 +1,55 @@
+# sizing.py — Vectorized position sizing across ladder levels for a whole portfolio
+#
+# The risk budget (equity × risk_pct) is what is lost if every level fills and SL is hit;
+# the scheme only decides how that budget is split across L0..L2.
+
+import numpy as np
+
+SCHEMES = ("equal", "weighted", "risk_parity")
+DEFAULT_WEIGHTS = (1.0, 2.0, 3.0)  # "weighted": more size further from market
+
+def level_matrix(ladders) -> np.ndarray:
+    # (N, 3) level prices from a LADDER_DTYPE array, NaN where a ladder has only two levels
+    return np.stack([ladders["L0"], ladders["L1"], ladders["L2"]], axis=-1)
+
+def size_ladders(levels, sl, tp, side, equity, risk_pct: float = 0.01, scheme: str = "equal",
+                 weights=DEFAULT_WEIGHTS) -> dict:
+    # levels: (N, k) prices, NaN = unused; sl/tp/side/equity: (N,) or scalars.
+    # Returns per-level qty plus blended entry, risk, reward:risk and notional per instrument.
+    if scheme not in SCHEMES:
+        raise ValueError(f"scheme must be one of {', '.join(SCHEMES)}")
+    levels = np.atleast_2d(np.asarray(levels, dtype=np.float64))
+    n = levels.shape[0]
+    sl, tp, equity = (np.broadcast_to(np.asarray(a, dtype=np.float64), (n,)) for a in (sl, tp, equity))
+    is_long = np.broadcast_to(np.asarray(side) == "Long", (n,))
+    used = ~np.isnan(levels)
+    risk_per_unit = np.where(used, np.abs(levels - sl[:, None]), 0.0)
+
+    # Relative size per level before scaling to the risk budget
+    if scheme == "equal":
+        rel = used.astype(np.float64)
+    elif scheme == "weighted":
+        # Levels are stored high→low; depth 0 is nearest market (top for longs, bottom for shorts)
+        depth = np.where(is_long[:, None], np.cumsum(used, 1), np.cumsum(used[:, ::-1], 1)[:, ::-1]) - 1
+        w = np.asarray(weights, dtype=np.float64)
+        rel = np.where(used, w[np.clip(depth, 0, len(w) - 1)], 0.0)
+    else:
+        rel = np.where(used & (risk_per_unit > 0), 1.0 / np.where(risk_per_unit > 0, risk_per_unit, 1.0), 0.0)
+
+    budget = equity * risk_pct
+    risk_rel = (rel * risk_per_unit).sum(1)
+    scale = np.where(risk_rel > 0, budget / np.where(risk_rel > 0, risk_rel, 1.0), 0.0)
+    qty = rel * scale[:, None]
+
+    total_qty = qty.sum(1)
+    blended = np.where(total_qty > 0, np.where(used, qty * levels, 0.0).sum(1) / np.where(total_qty > 0, total_qty, 1.0), np.nan)
+    reward = np.where(is_long, tp - blended, blended - tp)
+    risk = np.where(is_long, blended - sl, sl - blended)
+    return {
+        "qty": qty,
+        "total_qty": total_qty,
+        "blended_entry": blended,
+        "risk_amount": (qty * risk_per_unit).sum(1),
+        "blended_rr": np.where(risk > 0, reward / np.where(risk > 0, risk, 1.0), np.nan),
+        "notional": np.where(used, qty * levels, 0.0).sum(1),
+    }
@@ -0,0 +1,144 @@
+# sweep.py — Parallel grid search over the ladder constants against historical data
+#
+#   python sweep.py ohlcv_1h.csv signals.csv sweep.csv --processes 8
+#   python sweep.py signals.csv sweep.csv --store data/ --symbol BTCUSDT    # mmapped OHLCVStore, no CSV parse
+#
+# Price arrays live in one shared-memory block that every worker maps read-only,
+# so the pool costs one copy of the history regardless of the number of cores.
+
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest import HORIZON, backtest_arrays, prepare_signals, summarize, trade_pnl
+from indicators import load_ohlcv
+from ladder_core import ADX_TREND, BASE_STEP_MULT, K_SPLIT, NUDGE_MULT, TP_MULT, LadderParams
+from ohlcv_store import OHLCVStore
+from result_cache import DiskCache, cache_key, code_version, data_fingerprint
+
+# ---------- Grid ----------
+DEFAULT_GRID = {
+    "base_step_mult": [0.25, BASE_STEP_MULT, 0.75],
+    "nudge_mult": [0.0, NUDGE_MULT, 0.5],
+    "tp_mult": [1.5, TP_MULT, 3.0],
+    "k_split": [0.8, K_SPLIT, 1.6],
+    "adx_trend": [20.0, ADX_TREND, 30.0],
+    "sl_buf": [1.0, 1.5],
+}
+
+def param_grid(grid: dict) -> list[dict]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+# ---------- Worker ----------
+_worker = {}
+
+def _init_worker(shm_name, shape, sig_arrays, horizon):
+    if shm_name is None:
+        ohlc = sig_arrays.pop("ohlc")
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker["shm"] = shm  # keep the mapping alive for the life of the worker
+        ohlc = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        ohlc.flags.writeable = False
+    _worker.update(ohlc=ohlc, sig=sig_arrays, horizon=horizon)
+
+def _run_combo(combo: dict) -> dict:
+    high, low, close = _worker["ohlc"]
+    s = _worker["sig"]
+    params = LadderParams(**{k: v for k, v in combo.items() if k != "sl_buf"})
+    _, _, side, levels, sl, _, fill_bar, _, exit_price, reason = backtest_arrays(
+        high, low, close, s["pos"], s["side"], s["zone_upper"], s["zone_lower"],
+        s["atr"], s["adx"], s["macd"], combo.get("sl_buf", 1.0), params, _worker["horizon"],
+        rsi_trigger=s["rsi_trigger"])
+    _, _, pnl, r_multiple = trade_pnl(side, levels, sl, fill_bar, exit_price)
+    return {**combo, **summarize(pnl, r_multiple, reason)}
+
+# ---------- Sweep ----------
+def run_sweep(ohlcv: pd.DataFrame, signals: pd.DataFrame, grid: dict | None = None, horizon: int = HORIZON,
+              processes: int | None = None, indicators: pd.DataFrame | None = None,
+              cache: DiskCache | None = None) -> pd.DataFrame:
+    sig = prepare_signals(ohlcv, signals, indicators)
+    sig_arrays = {
+        "pos": sig["pos"].to_numpy(), "side": sig["side"].to_numpy(dtype=str),
+        "zone_upper": sig["zone_upper"].to_numpy(np.float64), "zone_lower": sig["zone_lower"].to_numpy(np.float64),
+        "atr": sig["atr"].to_numpy(np.float64), "adx": sig["adx"].to_numpy(np.float64),
+        "macd": sig["macd"].to_numpy(dtype=str), "rsi_trigger": sig["rsi_trigger"].to_numpy(dtype=str),
+    }
+    ohlc = np.ascontiguousarray(ohlcv[["high", "low", "close"]].to_numpy(np.float64).T)
+    combos = param_grid(grid or DEFAULT_GRID)
+    rows, keys = [None] * len(combos), [None] * len(combos)
+    if cache is not None:
+        # Only combinations not already on disk for this data slice and code version are run
+        fp, version = data_fingerprint(ohlc, *sig_arrays.values()), code_version()
+        for i, combo in enumerate(combos):
+            keys[i] = cache_key(fp, {**combo, "horizon": horizon}, version)
+            rows[i] = cache.get(keys[i])
+    todo = [i for i, r in enumerate(rows) if r is None]
+    todo_combos = [combos[i] for i in todo]
+    processes = min(processes or os.cpu_count() or 1, max(1, len(todo)))
+
+    if processes == 1:
+        _init_worker(None, ohlc.shape, {**sig_arrays, "ohlc": ohlc}, horizon)
+        fresh = [_run_combo(c) for c in todo_combos]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=ohlc.nbytes)
+        try:
+            np.ndarray(ohlc.shape, dtype=np.float64, buffer=shm.buf)[:] = ohlc
+            with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                     initargs=(shm.name, ohlc.shape, sig_arrays, horizon)) as pool:
+                fresh = list(pool.map(_run_combo, todo_combos, chunksize=max(1, len(todo) // (processes * 4))))
+        finally:
+            shm.close()
+            shm.unlink()
+    for i, row in zip(todo, fresh):
+        rows[i] = row
+        if cache is not None:
+            cache.put(keys[i], row)
+    if cache is not None:
+        cache.evict()
+    return pd.DataFrame(rows).sort_values("mean_r", ascending=False, ignore_index=True)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Backtest a grid of ladder constants in parallel.")
+    ap.add_argument("ohlcv", nargs="?", help="1h OHLCV CSV (timestamp, open, high, low, close, volume); omit with --store")
+    ap.add_argument("signals", help="CSV with timestamp, side, zone_upper, zone_lower [, atr, adx, macd, rsi_trigger]")
+    ap.add_argument("output", help="CSV to write, one row per parameter combination")
+    ap.add_argument("--horizon", type=int, default=HORIZON)
+    ap.add_argument("--processes", type=int, default=None)
+    ap.add_argument("--cache-dir", default=None, help="reuse results from earlier sweeps stored here")
+    ap.add_argument("--store", default=None, help="read OHLCV from this OHLCVStore root instead of a CSV")
+    ap.add_argument("--symbol", default=None, help="series to read from --store")
+    ap.add_argument("--timeframe", default="1h", help="timeframe to read from --store (default 1h)")
+    ap.add_argument("--start", default=None, help="first bar to read from --store (inclusive)")
+    ap.add_argument("--end", default=None, help="last bar to read from --store (exclusive)")
+    args = ap.parse_args(argv)
+    if (args.store is None) == (args.ohlcv is None):
+        ap.error("give either an OHLCV CSV or --store (with --symbol)")
+    if args.store is not None and args.symbol is None:
+        ap.error("--store needs --symbol")
+    signals = pd.read_csv(args.signals)
+    signals.columns = [c.strip().lower() for c in signals.columns]
+    signals = signals.set_index(pd.to_datetime(signals.pop("timestamp"), utc=True))
+    try:
+        if args.store is not None:
+            ohlcv = OHLCVStore(args.store).frame(args.symbol, args.timeframe, args.start, args.end)
+        else:
+            ohlcv = load_ohlcv(args.ohlcv)
+        cache = DiskCache(args.cache_dir) if args.cache_dir else None
+        out = run_sweep(ohlcv, signals, horizon=args.horizon, processes=args.processes, cache=cache)
+    except (KeyError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    out.to_csv(args.output, index=False)
+    print(f"Wrote {len(out)} combinations to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
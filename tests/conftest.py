@@ -0,0 +1,6 @@
+# conftest.py — Put the repo root (flat modules) on sys.path for the test suite
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# test_backtest.py — Vectorized and bar-by-bar simulation kernels agree trade for trade
+
+import numpy as np
+import pandas as pd
+
+import backtest
+import sim_kernel
+from backtest import run_backtest, simulate
+from ladder_batch import batch_ladders
+
+def _market(seed=5, n=24 * 90, signals=300):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2022-01-01", periods=n, freq="h", tz="UTC")
+    close = np.abs(100 + np.cumsum(rng.normal(0, 0.3, n))) + 5
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.5, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.5, n)
+    ohlcv = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": 1.0}, index=idx)
+    pos = np.sort(rng.choice(np.arange(100, n), signals, replace=False))
+    mid, width = close[pos] + rng.uniform(-3, 3, signals), rng.uniform(1, 6, signals)
+    sig = pd.DataFrame({"side": rng.choice(["Long", "Short"], signals),
+                        "zone_upper": mid + width / 2, "zone_lower": mid - width / 2}, index=idx[pos])
+    return ohlcv, sig
+
+def test_simulate_loop_matches_simulate():
+    ohlcv, sig = _market()
+    high, low, close = (ohlcv[c].to_numpy() for c in ("high", "low", "close"))
+    pos = ohlcv.index.get_indexer(sig.index).astype(np.int64)
+    side = sig["side"].to_numpy()
+    res = batch_ladders(side, close[pos], sig["zone_upper"].to_numpy(), sig["zone_lower"].to_numpy(), 1.0)
+    levels = np.stack([res["L0"], res["L1"], res["L2"]], axis=1)
+    sl, tp = np.ascontiguousarray(res["sl"]), np.ascontiguousarray(res["tp"])
+    ref = simulate(high, low, close, pos, side == "Long", levels, sl, tp, 120)
+    for kernel in (sim_kernel.simulate_loop, sim_kernel.simulate_loop_py):
+        for a, b in zip(ref, kernel(high, low, close, pos, side == "Long", levels, sl, tp, 120)):
+            np.testing.assert_array_equal(a, b)
+
+def test_run_backtest_engines_agree(monkeypatch):
+    ohlcv, sig = _market(seed=11)
+    vector = run_backtest(ohlcv, sig, engine="vector")
+    pd.testing.assert_frame_equal(vector, run_backtest(ohlcv, sig, engine="loop"))
+    monkeypatch.setattr(backtest, "simulate_loop", sim_kernel.simulate_loop_py)
+    pd.testing.assert_frame_equal(vector, run_backtest(ohlcv, sig, engine="loop"))
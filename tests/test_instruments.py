@@ -0,0 +1,43 @@
+# test_instruments.py — Tick/lot snapping stays on-grid and rounds in the safe direction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from instruments import InstrumentIndex, snap_frame, snap_prices, snap_quantities
+from ladder_batch import batch_frame
+
+def test_multi_digit_ticks_stay_on_grid():
+    assert snap_prices([100.3, 100.8], 0.25, True).tolist() == [100.25, 100.75]
+    assert snap_prices(100.1, 0.25, False) == 100.25
+    assert snap_prices(100.3, 0.125, True) == 100.25
+    assert snap_prices(100.2, 0.125, False) == 100.25
+    assert snap_prices(0.123456789, 1e-8, True) == 0.12345678
+
+def test_sub_nano_ticks_keep_their_decimals():
+    assert snap_prices([0.5], 1e-9, True).tolist() == [0.5]
+    assert snap_prices([6.17e-9], 1e-10, True).tolist() == [6.1e-9]
+    assert snap_prices([6.17e-9], 1e-10, False).tolist() == [6.2e-9]
+    assert snap_prices([1.23456789012e-1], 1e-12, True).tolist() == [1.23456789012e-1]
+
+def test_lot_snapping_floors_to_lot():
+    idx = InstrumentIndex(pd.DataFrame({"symbol": ["ES"], "tick_size": [0.25], "lot_size": [0.25], "min_notional": [0.0]}))
+    assert snap_quantities(np.array([[1.6]]), np.array([[1.0]]), ["ES"], idx).tolist() == [[1.5]]
+
+def test_rr_uses_snapped_entry():
+    idx = InstrumentIndex(pd.DataFrame({"symbol": ["ES"], "tick_size": [0.25]}))
+    out = snap_frame(pd.DataFrame({"symbol": ["ES"], "side": ["Long"], "L0": [100.3], "sl": [95.1], "tp": [104.3], "rr": [0.0]}),
+                     idx, [100.3])
+    assert out["L0"].tolist() == [100.25]
+    assert out["rr"].iloc[0] == (out["tp"].iloc[0] - 100.25) / (100.25 - out["sl"].iloc[0])
+
+def test_invalid_rows_need_no_metadata():
+    idx = InstrumentIndex(pd.DataFrame({"symbol": ["ES"], "tick_size": [0.25], "lot_size": [1.0], "min_notional": [0.0]}))
+    table = pd.DataFrame({"symbol": ["ES", ""], "side": ["Long", "Long"], "market": [100.3, 0.0],
+                          "zone_upper": [101.0, 0.0], "zone_lower": [95.0, 0.0], "atr": [2.0, 0.0]})
+    out = snap_frame(batch_frame(table), idx, table["market"])
+    assert out["L0"].iloc[0] == 100.25 and np.isnan(out["L0"].iloc[1])
+    qty = snap_quantities(np.array([[1.5, 1.5, 1.5], [np.nan] * 3]), out[["L0", "L1", "L2"]].to_numpy(), out["symbol"], idx)
+    assert qty[0].tolist() == [1.0, 1.0, 1.0]
+    with pytest.raises(KeyError):
+        snap_frame(batch_frame(table.assign(symbol=["NQ", ""])), idx)
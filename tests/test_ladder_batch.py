@@ -0,0 +1,45 @@
+# test_ladder_batch.py — Vectorized engine broadcasting and parity with the scalar path
+
+import numpy as np
+import pytest
+
+from ladder_batch import batch_ladders, ladder_grid
+from ladder_core import compute_ladder
+
+def test_scalars_broadcast_against_string_arrays():
+    res = batch_ladders(np.array(["Long", "Short"]), 100.0, 101.0, 95.0, 2.0)
+    assert res.shape == (2,)
+    assert res["sl"].tolist() == [93.0, 103.0]
+    res = batch_ladders("Long", [100.0, 100.0], 101.0, 95.0, 2.0, macd=np.array(["Bullish", "Bearish"]))
+    assert res["step"].tolist() == [0.5, 1.5]
+    grid = ladder_grid(np.array(["Long", "Short"]), 100.0, 101.0, 95.0, 2.0, n_levels=3)
+    assert grid.tolist() == [[100.0, 99.0, 98.0], [100.0, 101.0, 101.0]]
+
+def test_grid_rejects_non_positive_steps():
+    for kwargs in ({"step_mult": -0.5}, {"step_mult": 0.0}, {"spacing": "geometric", "ratio": -1.0}):
+        with pytest.raises(ValueError):
+            ladder_grid("Long", 100.0, 101.0, 90.0, 2.0, n_levels=5, **kwargs)
+
+def test_batch_matches_compute_ladder():
+    rng = np.random.default_rng(7)
+    n = 2000
+    side = rng.choice(np.array(["Long", "Short"]), n)
+    zone_lower = rng.uniform(10, 100, n)
+    zone_upper = zone_lower + rng.uniform(0.1, 20, n)
+    market = zone_lower + rng.uniform(-5, 25, n)  # includes markets outside the zone and <= 0 rejects
+    atr = rng.uniform(0, 5, n)
+    adx = rng.uniform(0, 50, n)
+    macd = rng.choice(np.array(["Neutral", "Bullish", "Bearish"]), n)
+    rsi = rng.choice(np.array(["None", "Crossed 20↑", "Crossed 50↑"]), n)
+    sl_buf = rng.choice(np.array([1.0, 1.5]), n)
+    res = batch_ladders(side, market, zone_upper, zone_lower, atr, adx, macd, sl_buf, rsi_trigger=rsi)
+    for i in range(n):
+        try:
+            ref = compute_ladder(side[i], market[i], zone_upper[i], zone_lower[i], atr[i], adx[i], macd[i], sl_buf[i], rsi[i])
+        except ValueError:
+            assert not res["valid"][i]
+            continue
+        row = res[i]
+        assert row["valid"] and row["ladders"] == ref.ladders
+        assert [row[f"L{j}"] for j in range(len(ref.levels))] == list(ref.levels)
+        assert (row["sl"], row["tp"], row["rr"], row["k"], row["step"]) == (ref.sl, ref.tp, ref.rr, ref.k, ref.step)
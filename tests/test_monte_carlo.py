@@ -0,0 +1,34 @@
+# test_monte_carlo.py — Vectorized path scoring matches an explicit per-path walk
+
+import numpy as np
+
+from ladder_core import compute_ladder
+from monte_carlo import _simulate_chunk, simulate_ladder
+
+def _paths(seed, n, market, step_sd, steps):
+    # Same draw as _simulate_chunk
+    rng = np.random.default_rng(seed)
+    return market + np.cumsum(rng.standard_normal((n, steps), dtype=np.float32) * np.float32(step_sd), axis=1)
+
+def test_fills_match_per_path_loop():
+    seed, n, steps, step_sd = np.random.SeedSequence(1), 3000, 120, 0.3 * 2 / np.sqrt(6)
+    for side, levels, sl, tp in (("Long", (100.0, 99.0, 98.0), 93.0, 104.0), ("Short", (102.0, 101.0, 100.0), 107.0, 96.0)):
+        is_long = side == "Long"
+        _, fills, tp_n, sl_n, _, _ = _simulate_chunk((seed, n, 100.0, levels, sl, tp, is_long, step_sd, steps))
+        want, want_tp, want_sl = np.zeros(len(levels)), 0, 0
+        for path in _paths(seed, n, 100.0, step_sd, steps):
+            exit_i = next((i for i, x in enumerate(path) if (x <= sl or x >= tp if is_long else x >= sl or x <= tp)), steps)
+            if exit_i < steps:
+                hit_sl = path[exit_i] <= sl if is_long else path[exit_i] >= sl
+                want_sl, want_tp = want_sl + hit_sl, want_tp + (not hit_sl)
+            for j, lv in enumerate(levels):
+                if (lv >= 100.0) if is_long else (lv <= 100.0):
+                    want[j] += 1
+                elif any((x <= lv if is_long else x >= lv) for x in path[:exit_i + 1]):
+                    want[j] += 1
+        assert fills.tolist() == want.tolist()
+        assert (tp_n, sl_n) == (want_tp, want_sl)
+
+def test_untouched_levels_are_not_filled():
+    res = compute_ladder("Long", 100.0, 101.0, 95.0, 2.0)
+    assert simulate_ladder(res, 2.0, n_paths=20_000, vol_per_atr=0.01)["fill_prob"] == [1.0, 0.0, 0.0]
@@ -0,0 +1,40 @@
+# test_sweep.py — The sweep CLI reads the mmapped OHLCV store the same as the CSV it came from
+
+import numpy as np
+import pandas as pd
+
+import sweep
+from backtest import run_backtest
+from ohlcv_store import OHLCVStore
+
+def _write_inputs(tmp_path, n=24 * 30, signals=40, seed=2):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC", name="timestamp")
+    close = np.abs(100 + np.cumsum(rng.normal(0, 0.4, n))) + 5
+    open_ = np.r_[close[0], close[:-1]]
+    ohlcv = pd.DataFrame({"open": open_, "high": np.maximum(open_, close) + rng.uniform(0, 0.5, n),
+                          "low": np.minimum(open_, close) - rng.uniform(0, 0.5, n), "close": close, "volume": 1.0}, index=idx)
+    pos = np.sort(rng.choice(np.arange(200, n), signals, replace=False))
+    mid = close[pos]
+    sig = pd.DataFrame({"timestamp": idx[pos], "side": rng.choice(["Long", "Short"], signals),
+                        "zone_upper": mid + 1.5, "zone_lower": mid - 1.5})
+    ohlcv.to_csv(tmp_path / "ohlcv.csv")
+    sig.to_csv(tmp_path / "signals.csv", index=False)
+    OHLCVStore(str(tmp_path / "store")).import_csv(str(tmp_path / "ohlcv.csv"), "TEST", "1h")
+    return ohlcv, sig.set_index("timestamp")
+
+def test_sweep_from_store_matches_csv(tmp_path, monkeypatch):
+    _write_inputs(tmp_path)
+    monkeypatch.setattr(sweep, "DEFAULT_GRID", {"base_step_mult": [0.25, 0.5], "tp_mult": [1.5, 2.0]})
+    sig = str(tmp_path / "signals.csv")
+    assert sweep.main([str(tmp_path / "ohlcv.csv"), sig, str(tmp_path / "a.csv"), "--processes", "1"]) == 0
+    assert sweep.main([sig, str(tmp_path / "b.csv"), "--store", str(tmp_path / "store"), "--symbol", "TEST",
+                       "--processes", "1"]) == 0
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "a.csv"), pd.read_csv(tmp_path / "b.csv"))
+    assert sweep.main([sig, str(tmp_path / "c.csv"), "--store", str(tmp_path / "store"), "--symbol", "NOPE"]) == 1
+
+def test_store_lower_tf_loader(tmp_path):
+    ohlcv, sig = _write_inputs(tmp_path)
+    store = OHLCVStore(str(tmp_path / "store"))
+    by_frame = run_backtest(ohlcv, sig, lower_tf=lambda s, e: ohlcv.loc[s:e - pd.Timedelta(1)])
+    pd.testing.assert_frame_equal(by_frame, run_backtest(ohlcv, sig, lower_tf=store.lower_tf("TEST", "1h")))
@@ -0,0 +1,58 @@
+# ui_perf.py — Opt-in per-rerun timing panel for the Streamlit page
+#
+# Enable with ?perf=1 (or LADDER_PERF=1); ?perf=profile also captures a cProfile
+# of each rerun, downloadable from the sidebar.
+
+import cProfile
+import io
+import os
+import pstats
+import time
+
+import streamlit as st
+
+class PerfPanel:
+    def __init__(self):
+        self.t0 = self._last = time.perf_counter()
+        mode = str(st.query_params.get("perf", os.environ.get("LADDER_PERF", ""))).lower()
+        self.enabled = mode not in ("", "0", "false", "off")
+        self.sections = {}
+        self._profiler = None
+        self._done = False
+        if self.enabled:
+            st.session_state["perf_reruns"] = st.session_state.get("perf_reruns", 0) + 1
+            if mode == "profile":
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+
+    def mark(self, section: str):
+        # Attribute the time since the previous mark to `section`
+        now = time.perf_counter()
+        self.sections[section] = self.sections.get(section, 0.0) + (now - self._last)
+        self._last = now
+
+    @property
+    def finished(self) -> bool:
+        return self._done
+
+    def finish(self, target=None):
+        # Call once at the end of the rerun (and before any st.stop()). Fragment reruns pass a
+        # container of their own, since a fragment can't write to the sidebar.
+        if not self.enabled or self._done:
+            return
+        self._done = True
+        total = time.perf_counter() - self.t0
+        if self._profiler is not None:
+            self._profiler.disable()
+            buf = io.StringIO()
+            pstats.Stats(self._profiler, stream=buf).sort_stats("cumulative").print_stats(40)
+            st.session_state["perf_profile"] = buf.getvalue()
+        with target if target is not None else st.sidebar:
+            st.markdown("### Performance")
+            st.caption(f"Rerun #{st.session_state['perf_reruns']} this session • total {total*1e3:.1f} ms")
+            for name, secs in self.sections.items():
+                st.text(f"{name:<10} {secs*1e3:8.2f} ms")
+            if "perf_profile" in st.session_state:
+                with st.expander("cProfile (last rerun)"):
+                    st.code(st.session_state["perf_profile"], language=None)
+                st.download_button("Download profile", st.session_state["perf_profile"], file_name="ladder_profile.txt")